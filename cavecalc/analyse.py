@@ -30,6 +30,19 @@ import scipy.io as sio
 import seaborn as sns
 from matplotlib.lines import Line2D
 
+def _read_output_dir(directory):
+    """Read settings.pkl and results.pkl from a model output directory.
+    
+    Returns:
+        A tuple of (settings, results) tuples.
+    """
+    
+    with open(os.path.join(directory, 'settings.pkl'), 'rb') as f:
+        settings = tuple(pickle.load(f))
+    with open(os.path.join(directory, 'results.pkl'), 'rb') as f:
+        models = tuple(a for (a,b) in pickle.load(f))
+    return settings, models
+
 class Evaluate(object):
     """Processes of Cavecalc model output.
     
@@ -42,6 +55,9 @@ class Evaluate(object):
     
     Methods:
     settings_report - Get a dict summarising model settings
+        output_names        - Get the names of the model outputs
+        get_outputs         - Get one model output from all models
+        get_setting_values  - Get one model setting from all models
         load_data           - Load .pkl files from a directory
         save_csvs           - Save all loaded model output to .csv files
         save_all_mat        - Save all loaded model output to a .mat file
@@ -107,6 +123,45 @@ class Evaluate(object):
         else:
             raise ValueError("Object %r has no models loaded." % self)
     
+    def output_names(self):
+        """Return the model output names, as a tuple, without copying data.
+        
+        Names are taken from the first loaded model.
+        """
+        
+        if not self._models:
+            raise ValueError("Object %r has no models loaded." % self)
+        return tuple(self._models[0].keys())
+        
+    def get_outputs(self, key):
+        """Get one model output from all loaded models.
+        
+        Faster than model_results when only a few outputs are needed, as
+        only the requested data is copied.
+        
+        Args:
+            key: Model output name (e.g. 'd13C').
+        Returns:
+            A list with one list of values per model.
+        """
+        
+        if not self._models:
+            raise ValueError("Object %r has no models loaded." % self)
+        return [list(m[key]) for m in self._models]
+        
+    def get_setting_values(self, setting):
+        """Get the value of one setting for all loaded models.
+        
+        Args:
+            setting: Model input parameter name (e.g. 'gas_volume').
+        Returns:
+            A list with one value per model.
+        """
+        
+        if not self._settings:
+            raise ValueError("Object %r has no models loaded." % self)
+        return [copy.deepcopy(s.get(setting)) for s in self._settings]
+    
     def get_settings_report(self):
         """Get a summary of the range of model settings.
 
@@ -114,17 +169,21 @@ class Evaluate(object):
         A dict of model settings, with one entry for each unique value detected.
         """
 
-        d = self.model_settings[0]
-        o = dict.fromkeys(d.keys(),[])
-        for s in self.model_settings:
-            for k, v in s.items():
-                if v not in o[k]:
-                    o[k].append(v)
+        if not self._settings:
+            raise ValueError("Object %r has no models loaded." % self)
+        
+        # read each settings object directly; values are copied on output
+        o = {}
+        for s in self._settings:
+            for k, v in vars(s).items():
+                vals = o.setdefault(k, [])
+                if v not in vals:
+                    vals.append(v)
         try:
             o.pop('id')
         except KeyError:
             pass
-        return o
+        return copy.deepcopy(o)
 
     def load_data(self, *args):
         """Load .pkl data into the Evaluate object for processing.
@@ -137,24 +196,15 @@ class Evaluate(object):
             *args: The directories to load data from.
         """        
 
-        ret_dir = os.getcwd()
-        
         if len(args) == 0:
-            args = (ret_dir,)
+            args = (os.getcwd(),)
             
         for d in args:
-            os.chdir(d)
-            try:
-                print("Attempting to load data from %s..." % d, end="")
-                with open('settings.pkl', 'rb') as f:
-                    self._settings.extend(pickle.load(f))
-
-                with open('results.pkl', 'rb') as f:
-                    r = pickle.load(f)
-                    self._models.extend([a for (a,b) in r])
-                print(" Done")
-            finally:
-                os.chdir(ret_dir)
+            print("Attempting to load data from %s..." % d, end="")
+            settings, models = _read_output_dir(d)
+            self._settings.extend(settings)
+            self._models.extend(models)
+            print(" Done")
 
     def save_csvs(self, directory=None):
         """Save model output to .csv files.
@@ -196,15 +246,8 @@ class Evaluate(object):
             
             # remove any 'None' values from output (savemat can't handle them)
             # replace with -999 value, like PHREEQC
-            n_res = dict()
-            for k,v in res.items():
-                nv = []
-                for e in v:
-                    if e is None:
-                        nv.append(-999)
-                    else:
-                        nv.append(e)
-                n_res[k] = nv
+            n_res = {k : ([-999 if e is None else e for e in v] 
+                          if None in v else v) for k,v in res.items()}
         
             o = {k:(v if type(v) is list else [v]) for k,v in set.items()}
             
@@ -291,7 +334,8 @@ class Evaluate(object):
         [A._models.pop(i) for i in rem]
         [A._settings.pop(i) for i in rem]
         
-        return copy.deepcopy(A)
+        # A._settings is already a deep copy and A._models holds new lists
+        return A
             
     def filter_by_results(self, key, value, n=False):
         """Return a filtered copy of the Evaluate object. 
@@ -319,22 +363,22 @@ class Evaluate(object):
 
         A = Evaluate()
         A._models = []
-        A._settings = self._settings
+        A._settings = copy.deepcopy(self._settings)
 
         # filter object
         for i, m in enumerate(self._models):
             fil = {}
             a = m[key]
+            
+            # test each step once, then apply the selection to every output
+            keep = [k for k, s in enumerate(a) if (value in s) != bool(n)]
             for j, v in m.items():
                 if len(v) == len(a):
-                    if n:
-                        fil[j] = [v[k] for k in range(len(v)) if value not in a[k]]
-                    else:
-                        fil[j] = [v[k] for k in range(len(v)) if value in a[k]]
+                    fil[j] = [v[k] for k in keep]
                 else:
-                    fil[j] = v
+                    fil[j] = copy.deepcopy(v)
             A._models.append(fil)
-        return copy.deepcopy(A)
+        return A
 
     def filter_by_settings(self, setting, value, n=False):
         """Return a filtered copy of the Evaluate object.
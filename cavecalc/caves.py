@@ -1643,6 +1643,9 @@ class Simulator(object):
                 
         ccu.PostProcessor(self) # perform offline calculations and processing
         
+        if self.settings['phreeqc_log_file']:
+            self.input_log.close()
+        
         return self.output
         
     def save_results(self, format='.pkl', filename='output'):
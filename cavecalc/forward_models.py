@@ -225,6 +225,7 @@ class ForwardModels(object):
             # Handle user_filepath logic if it exists in settings
             
         finally:
+            ccu.flush_cda()     # write queued CDA results
             os.chdir(ret_dir)
 
     def save(self):
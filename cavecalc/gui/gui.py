@@ -11,11 +11,11 @@ GUIs may be accessed by running the scripts:
 
 import os
 
-import copy
 import importlib.resources
 import subprocess
-from collections import OrderedDict
-import operator
+import queue
+import threading
+from functools import lru_cache, partial
 from numpy import linspace
 import matplotlib
 from sys import platform
@@ -24,12 +24,13 @@ if platform != 'win32':
 from matplotlib import pyplot as plt
 from tkinter import *
 from tkinter import filedialog
+from tkinter.font import Font
 from cavecalc.analyse import Evaluate
 import cavecalc.data.types_and_limits
 import cavecalc.gui
 import cavecalc.gui.mapping  
 import cavecalc.gui.layout
-from cavecalc.setter import SettingsMaker, NameSwitcher, SettingsObject
+from cavecalc.setter import SettingsMaker, NameSwitcher, SettingsObject, cc_types
 import time
 from tkinter import Toplevel, Label  # Ensure Toplevel is imported
 from tkinter import messagebox
@@ -37,24 +38,171 @@ from tkinter import ttk
 
 # settings options hidden from plotting menus (useless clutter)
 HIDE_OPS = True
-HIDDEN_OPTS = [
+HIDDEN_OPTS = frozenset([
     'totals',  'molalities',   'isotopes',     'out_dir', 
     'phreeqc_log_file',        'phreeqc_log_file_name',
-    'database'] # options not available for plotting
+    'database']) # options not available for plotting
+
+# Tk font specs
+FONT_WELCOME = ("Arial", 16)
+FONT_WELCOME_SUB = ("Arial", 12)
+
+# height (px) of the empty spacer row at the top of each input GUI column
+TOP_ROW_HEIGHT = 20
+
+# key CDA parameters, labelled in red in the input GUI
+HIGHLIGHT_KEYS = frozenset({
+    'soil_d13C', 'soil_pCO2', 'cave_pCO2', 'gas_volume', 'temperature',
+    'atm_d18O'})
+
+# input GUI tooltips for each model parameter
+VARIABLE_TOOLTIPS = {
+    #CDA
+    'soil_d13C': 'Sets the stbale carbon isotopic composition of the soil-water and soil-gas. Impacts speleothem d13C', 
+    'soil_pCO2': 'Sets the concentrations of CO2 witin the soil. Alters the extent of bedrock dissolution, and amount of degassing steps. Impacts d13C, d44Ca, DCP, and X/Ca', 
+    'cave_pCO2': 'Sets the concentration of cave air CO2. Alters the amount of degassing and prior carbonate precipitation. Impacts d13C, d44Ca and X/Ca', 
+    'gas_volume': 'Sets the conditions of bedrock dissolution. More open-system conditions is given by a higher gas volume. Impacts DCP and d13C', 
+    'temperature': 'Alters temperature of the cave environment. Impacts fractionation factors of d18O, d13C, and partitioninng coefficients of X/Ca ', 
+    'atm_d18O': 'Sets the rainfall (‰, SMOW) value infilitrating into the karst. Impacts d18O',
+    
+    #Other
+    'atm_O2': 'Sets the atmospheric O2 (given as a decimal fraction)',
+    'atm_pCO2': 'Provides the concentration of atmospheric pCO2. If atmo_exchange > 0, will impact soil-water equilibriation',
+    'atm_d13C': 'Provides the stable carbon isotope composition of atmospheric pCO2. If atmo_exchange > 0, will impact d13C after soil-water equilibriation',
+    'atm_R14C': 'Sets the radiocarbon activity of atmospheric 14C',
+    'soil_O2': 'Sets the percentage of O2 gas within the soil (given as a decimal fraction). If bedrock_pyrite > 0, will impact the amount of pyrite oxidation',
+    'soil_R14C': 'Sets the radiocarbon activity within the soil. Impacts DCP',
+    # Soil Gas Mixing
+    'atmo_exchange': 'Sets the amount of atmospheric excahnge with the soil, impacting soil-water equilibriation',
+    'init_O2':     'A mix of the soil and atm O2. Defines the final soilwater gas O2',  
+    'init_R14C':	'A mix of the soil and atm R14C. Defines final soilwater gas R14C',  	
+    'init_d13C':	'A mix of the soil and atm d13C. Defines final soilwater gas d13C',  	
+    'init_pCO2':	'A mix of the soil and atm pCO2. Defines final soilwater gas pCO2',  	
+    
+    'soil_Ba': 'Alters the amount of Ba provided by the soil. Impacts Ba/Ca',
+    'soil_Ca':  'Alters the amount of Ca provided by the soil. Impacts X/Ca',
+    'soil_Mg':  'Alters the amount of Ca provided by the soil. Impacts Mg/Ca',
+    'soil_Sr': 'Alters the amount of Ca provided by the soil. Impacts Sr/Ca',
+    'soil_U':  'Alters the amount of Ca provided by the soil. Impacts U/Ca',
+    'soil_d44Ca':  'Alters the d44Ca of the soil. Impacts d44Ca',
+    
+    'bedrock_BaCa': 'Alters the amount of Ba provided by the bedrock. Impacts Ba/Ca',
+    'bedrock_Ca':  'Alters the amount of Ca provided by the bedrock. Impacts X/Ca',
+    'bedrock_MgCa':  'Alters the amount of Mg provided by the bedrock. Impacts Mg/Ca',
+    'bedrock_SrCa': 'Alters the amount of Sr provided by the bedrock. Impacts Sr/Ca',
+    'bedrock_UCa':  'Alters the amount of U provided by the bedrock. Impacts U/Ca',
+    'bedrock_d44Ca':  'Alters the d44Ca of the bedrock. Impacts d44Ca',
+    'bedrock_d13C':  'Alters the d13C of the bedrock. Impacts d13C',
+    'bedrock_d18O':  'Alters the d18O of the bedrock. Impacts d18O',
+    
+    
+
+    # Bedrock Dissolution Conditions
+    'bedrock': 'Alters the amount if bedrock equilibriation with the soil gas. Impacts d13C and DCP',
+    'bedrock_pyrite': 'Alters the amount of pryite available for oxidation. Amount of oxidation also a function of soil_O2. Impacts d13C and DCP',                
+    'reprecip': 'Controls whether re-precipitation can occur. Impacts d13C, d44Ca and X/Ca',
+    
+    # Cave Air   
+    'cave_d13C': 'Alters the stable carbon isotope composition of cave air. NOTE: Default mode does not allow for equilibriaiton with the cave air. To do so, change Degassing/Precipitation Mode to single_step_degassing',
+    'cave_R14C':  'Alters the radiocarbon value of cave air that is equilibriated with the solution R14C. NOTE: Default CaveCalc mode does not allow for equilibriaiton with the cave air. Change Degassing/Precipitation Mode to single_step_degassing to test',
+    'cave_d18O':  'Alters the cave air d18O that is equilibriated with the solution d18O. NOTE: Default CaveCalc mode does not allow for equilibriaiton with the cave air. Change Degassing/Precipitation Mode to single_step_degassing to test',
+    'cave_air_volume': 'Alters the extent of equilibriation with the cave air. NOTE: Default CaveCalc mode does not allow for equilibriaiton with the cave air. Change Degassing/Precipitation Mode to single_step_degassing to test',
+
+    'kinetics_mode': 'Alters fundamental aspects of speleothem chemistry. Refer to Owen et al., 2018: CaveCalc: A new model for speleothem chemistry & isotopes',
+    'precipitate_mineralogy': 'Alters the precipitate mineralogy. Impacts d13C, d18O, X/Ca, and d44Ca',
+
+    
+    'co2_decrement': 'Fraction of CO2(aq) removed on each degassing step. Alters the resolution of the evolution of d13C, d44Ca, and X/Ca',
+    'calcite_sat_limit': 'Only used when kinetics_mode = ss. CaCO3 only precipitates when saturation index exceeds this value. Impacts d13C, d44Ca, X/Ca and d18O',  
+    
+    'user_filepath': 'File to users measured data, stored in a timer-series', 
+}
+
+# CDA help text shipped with the cavecalc.gui package
+HELP_FILE = str(importlib.resources.files(cavecalc.gui).joinpath('CDA_help.txt'))
+
+# command used to open files with the system default application.
+# None on Windows, where os.startfile is used instead.
+if platform == 'win32':
+    _OPENER = None
+elif platform == 'darwin':
+    _OPENER = ['open']
+else:
+    _OPENER = ['xdg-open']
 
 ns = NameSwitcher()
 
+# GUI layout codes for each parameter (read-only)
+gui_layout = {k:v for k,v in vars(cavecalc.gui.layout).items() if '__' not in k}
+
+# layout type by both code and readable names (read-only, see get_ln)
+layout_types = {k: t for k, (_, t) in gui_layout.items()}
+layout_types.update({ns.m2g[k]: t for k, (_, t) in gui_layout.items() 
+                     if k in ns.m2g})
+
+@lru_cache(maxsize=None)
+def default_settings():
+    """Default model settings (read-only), as used to populate the GUI."""
+    
+    return SettingsObject().dict()
+
+@lru_cache(maxsize=None)
+def ns_name(name):
+    """Memoised ns() for a single parameter name (str)."""
+    
+    return ns(name)
+
+@lru_cache(maxsize=None)
+def setting_options(keys):
+    """Sorted, readable names of model settings for the plotting menus.
+    
+    Args:
+        keys: A tuple of settings names. Entries in HIDDEN_OPTS are left
+            out when HIDE_OPS is True.
+    Returns:
+        A sorted tuple of names.
+    """
+    
+    o = []
+    for entry in keys:
+        if HIDE_OPS and entry in HIDDEN_OPTS:
+            continue
+        try:
+            o.append(ns_name(entry))
+        except KeyError:
+            o.append(entry)
+    return tuple(sorted(o))
+
+@lru_cache(maxsize=None)
+def sorted_options(keys):
+    """Sorted tuple of model output names (a tuple) for the plotting menus."""
+    
+    return tuple(sorted(keys))
+
+@lru_cache(maxsize=128)
+def range_values(min_val, max_val, steps):
+    """Memoised numpy.linspace, as a tuple, for InputsRangeWidget."""
+    
+    return tuple(linspace(min_val, max_val, num=steps).tolist())
+
+def _open_with_default_app(path):
+    """Open a file with the default application without blocking the GUI."""
+    
+    if _OPENER is None:
+        os.startfile(path)
+    else:
+        subprocess.Popen(_OPENER + [path])
 
 def od(dict):
-    """Converts a dict to an ordered dict, sorted by key."""
+    """Returns a copy of a dict, sorted by key."""
     
-    return OrderedDict(sorted(dict.items()))
+    return {k: dict[k] for k in sorted(dict)}
 
 def py2tk(dict):
     """Converts a dict to Tkinter types.
     
     Convert dictionary entries from doubles and strings to StringVar for use 
-    with tkinter. Returns a modified copy.
+    with tkinter. Returns a new dict.
     
     Args:
         dict: A dict with entries that are simple data types.
@@ -62,44 +210,40 @@ def py2tk(dict):
         A modified dict.
     """
     
-    out = copy.copy(dict)
-    types = vars(cavecalc.data.types_and_limits).copy()
-    
-    for k in dict.keys():
-        if type(types[k]) is bool:
-            out[k] = BooleanVar()
-            out[k].set(False)
-        elif dict[k] is not None:
-            out[k] = StringVar()
-            out[k].set(dict[k])
+    out = {}
+    for k, v in dict.items():
+        if isinstance(cc_types[k], bool):
+            out[k] = BooleanVar(value=False)
+        elif v is not None:
+            out[k] = StringVar(value=v)
         else:
             out[k] = None
     return out
     
+# strips brackets and turns commas into spaces, for _parse_value_input
+PARSE_TABLE = str.maketrans({'(': None, ')': None, '[': None, ']': None, 
+                             ',': ' '})
+
 def _parse_value_input(string, allow=[]):
     """
     Parses leftmost panel input to detect ranges of values or single values.
     Returns either a double or a list of doubles.
     """
-    a = string
-    
-    # remove brackets
-    rm = ['(', ')', '[', ']']
-    for s in rm:
-        if s not in allow:
-            a = a.replace(s,'')
     
-    # replace commas with space
-    a = a.replace(',',' ')
+    # remove brackets and replace commas with space
+    if allow:
+        table = {c: r for c, r in PARSE_TABLE.items() if chr(c) not in allow}
+    else:
+        table = PARSE_TABLE
     
-    #split string on spaces
-    a = a.split(' ')
+    #split string on whitespace
+    a = string.translate(table).split()
     
     # attempt conversion to float (most data types are numeric)
     try:
-        b = [float(v) for v in a if v != '']
+        b = [float(v) for v in a]
     except ValueError:
-        b = [str(v) for v in a if v!= '']
+        b = a
     
     # remove list structure from single entries
     if len(b) == 1:
@@ -107,6 +251,35 @@ def _parse_value_input(string, allow=[]):
     
     return b
     
+def bulk_get(variables):
+    """Get the values of several Tk variables with a single Tcl call.
+    
+    Equivalent to [v.get() for v in variables], but avoids one round trip
+    to the Tcl interpreter per variable.
+    
+    Args:
+        variables: A list of tkinter Variable objects.
+    Returns:
+        A list of their values.
+    """
+    
+    if not variables:
+        return []
+    
+    tk = variables[0]._tk
+    script = 'list ' + ' '.join('${%s}' % v._name for v in variables)
+    raw = tk.splitlist(tk.eval(script))
+    
+    out = []
+    for v, r in zip(variables, raw):
+        if isinstance(v, BooleanVar):
+            out.append(tk.getboolean(r))
+        elif isinstance(v, StringVar):
+            out.append(str(r))
+        else:
+            out.append(v.get())
+    return out
+    
 def tk2py(dict, parse=False):
     """Inverse of py2tk.
     
@@ -121,20 +294,16 @@ def tk2py(dict, parse=False):
         A dictionary of booleans, strings, lists and floats.
     """    
     
-    a = dict.copy()
-    for k in dict.keys():
-        if dict[k] is None:
-            a[k] = None
-        elif type(dict[k].get()) is str:
-            if parse:
-                a[k] = _parse_value_input(dict[k].get())
-            else:
-                a[k] = dict[k].get()
-        else:
-            a[k] = dict[k].get()
-        
-    b = {k:v for k,v in a.items() if v is not None}
-    return b
+    keys = [k for k, v in dict.items() if v is not None]
+    vals = bulk_get([dict[k] for k in keys])
+    
+    out = {}
+    for k, val in zip(keys, vals):
+        if isinstance(val, str) and parse:
+            val = _parse_value_input(val)
+        if val is not None:
+            out[k] = val
+    return out
 
 def gplot(  x_values, y_values, x_label, y_label, 
            label_vals, label_name ):
@@ -180,48 +349,84 @@ def gplot(  x_values, y_values, x_label, y_label,
      
     # else plot each model as it's own series
     else:
-        for (i, xs) in enumerate(x_values):
-            ys = y_values[i]
-            if label_name:
-                l_str = "%s: %s" % (label_name, label_vals[i])
-                ax.plot(xs, ys, label = l_str)
-                ax.legend(prop={'size':8})
-            else:
-                ax.plot(xs, ys)
+        # one plot call for all series (x1, y1, x2, y2, ...)
+        series = [v for xy in zip(x_values, y_values) for v in xy]
+        lines = ax.plot(*series)
+        
+        if label_name:
+            for line, label in zip(lines, label_vals):
+                line.set_label("%s: %s" % (label_name, label))
+            ax.legend(prop={'size':8})
             
         plt.ylabel(y_label)
         plt.xlabel(x_label)
         
         plt.show(block=False)
         
-class Tooltip:
-    def __init__(self, widget, text):
-        self.widget = widget
-        self.text = text
-        self.tooltip = None
-
-        self.widget.bind("<Enter>", self.show_tooltip)
-        self.widget.bind("<Leave>", self.hide_tooltip)
+class TooltipManager(object):
+    """Shows help text when the mouse hovers over registered widgets.
+    
+    Widgets are registered with register(). Rather than binding <Enter> and
+    <Leave> on each widget, registered widgets share a bindtag that is bound
+    once. A single tooltip window is reused for all widgets and is only 
+    hidden (not destroyed) when the mouse leaves. Display is delayed slightly
+    so that the window is not created for transient hovers.
+    """
+    
+    TAG = 'CavecalcTooltip'
+    DELAY = 200 # ms
+    
+    def __init__(self, master):
+        self.master = master
+        self.texts = {}
+        self._after_id = None
+        self._top = None
+        self._label = None
+        
+        self.master.bind_class(self.TAG, "<Enter>", self.show_tooltip)
+        self.master.bind_class(self.TAG, "<Leave>", self.hide_tooltip)
+        
+    def register(self, widget, text):
+        """Show 'text' when the mouse hovers over 'widget'."""
+        
+        self.texts[str(widget)] = text
+        widget.bindtags((self.TAG,) + widget.bindtags())
 
-    def show_tooltip(self, event=None):
-        if self.tooltip:
+    def show_tooltip(self, event):
+        self._cancel()
+        widget = event.widget
+        self._after_id = self.master.after(self.DELAY, 
+                                           lambda: self._really_show(widget))
+        
+    def _really_show(self, widget):
+        self._after_id = None
+        if not widget.winfo_exists():
             return
         
-        x, y, _, _ = self.widget.bbox("insert")
-        x += self.widget.winfo_rootx() + 25
-        y += self.widget.winfo_rooty() + 25
+        x, y, _, _ = widget.bbox("insert")
+        x += widget.winfo_rootx() + 25
+        y += widget.winfo_rooty() + 25
         
-        self.tooltip = Toplevel(self.widget)
-        self.tooltip.wm_overrideredirect(True)
-        self.tooltip.wm_geometry(f"+{x}+{y}")
-
-        label = Label(self.tooltip, text=self.text, background="lightyellow", relief="solid", borderwidth=1)
-        label.pack()
+        if self._top is None or not self._top.winfo_exists():
+            self._top = Toplevel(self.master)
+            self._top.wm_overrideredirect(True)
+            self._label = Label(self._top, background="lightyellow", relief="solid", borderwidth=1)
+            self._label.pack()
+        
+        self._label.configure(text=self.texts.get(str(widget), ''))
+        self._top.wm_geometry(f"+{x}+{y}")
+        self._top.deiconify()
+        self._top.lift()
 
     def hide_tooltip(self, event=None):
-        if self.tooltip:
-            self.tooltip.destroy()
-            self.tooltip = None        
+        self._cancel()
+        if self._top is not None and self._top.winfo_exists():
+            self._top.withdraw()
+            
+    def _cancel(self):
+        if self._after_id is not None:
+            self.master.after_cancel(self._after_id)
+            self._after_id = None
     
 class FileFindWidget(Frame):
     """A Tkinter Widget for opening a file browser window."""
@@ -231,31 +436,37 @@ class FileFindWidget(Frame):
         self.master = master
         self.value = value
         
-        self.entry = Entry(self, textvariable=value).grid(row=0, column=0)
-        
-        if mode.capitalize() == 'Load':
-            self.button = Button(self, text='browse', command= self._openfilename)
-        elif mode.capitalize() == 'Save':
-            self.button = Button(self, text='browse', command= self._saveasfilename)
-        elif mode.capitalize() == 'Dir':
-            self.button = Button(self, text='browse', command= self._getdirectory)
-        else:
+        commands = {'Load': self._openfilename,
+                    'Save': self._saveasfilename,
+                    'Dir': self._getdirectory}
+        try:
+            command = commands[mode.capitalize()]
+        except KeyError:
             raise ValueError("Mode %s not recognised. Use save or load." % mode)
+        
+        self._last_dir = os.getcwd()
+        self.entry = Entry(self, textvariable=value)
+        self.entry.grid(row=0, column=0)
+        
+        self.button = Button(self, text='browse', command=command)
         self.button.grid(row=0, column=1)
         
     def _openfilename(self, event=None):
-        file_path = filedialog.askopenfilename()
+        file_path = filedialog.askopenfilename(initialdir=self._last_dir)
         if file_path:
+            self._last_dir = os.path.dirname(file_path)
             self.value.set(file_path)
         
     def _saveasfilename(self, event=None):
-        file_path = filedialog.asksaveasfilename()
+        file_path = filedialog.asksaveasfilename(initialdir=self._last_dir)
         if file_path:
+            self._last_dir = os.path.dirname(file_path)
             self.value.set(file_path)
             
     def _getdirectory(self, event=None):
-        dir_path = filedialog.askdirectory()
+        dir_path = filedialog.askdirectory(initialdir=self._last_dir)
         if dir_path:
+            self._last_dir = dir_path
             self.value.set(dir_path)
              
 class InputsRangeWidget(Frame):
@@ -290,8 +501,7 @@ class InputsRangeWidget(Frame):
                 steps = int(float(self.steps.get()))  # Convert to integer 
                 
                 # Generate the range using linspace
-                vals = linspace(min_val, max_val, num=steps)
-                self.value.set(vals.tolist())
+                self.value.set(list(range_values(min_val, max_val, steps)))
                 top.destroy() 
             except ValueError as e: 
                 print(f"Error: {e}. Ensure all inputs are numbers.") 
@@ -351,41 +561,49 @@ class CCInputGUI(object):
         """Initialize the main GUI."""
         
         self.master = master
+        self._last_dir = os.getcwd()
         
         self.master.title('Cavecalc Model Input GUI')
               
         # Show loading screen
         self._show_loading_screen()
+        self._tooltips = TooltipManager(self.master)
+        # named fonts shared by all section labels
+        self._header_font = Font(root=self.master, size=13)
+        self._heading_font = Font(root=self.master, size=12, weight='bold')
         self._load_defaults()
         self.CDA_input_path = StringVar()
         self.CDA_path = StringVar()
         self.construct_inputs()
-       
+        
+        # Close the loading screen as soon as the inputs are built
+        self._loading_screen.after_idle(self._loading_screen.destroy)
         
     def _show_loading_screen(self):
-        """Display a loading screen with a welcome message and call the initialization callback."""
+        """Display a loading screen with a welcome message.
+        
+        The loading screen is shown while the input panels are built and is
+        closed by __init__ once they are ready.
+        """
         
         # Create a loading screen
         loading_screen = Toplevel(self.master)
+        self._loading_screen = loading_screen
         loading_screen.title("Welcome!")
         
         # Set the dimensions and position of the loading screen
         loading_screen.geometry("300x150")
         
         # Create a label with the welcome message
-        label = Label(loading_screen, text="Welcome to CaveCalc v2.0", font=("Arial", 16))
+        label = Label(loading_screen, text="Welcome to CaveCalc v2.0", font=FONT_WELCOME)
         label.pack(expand=True)
         
         # Create another label for the additional message
-        additional_label = Label(loading_screen, text="Always go feet first into CaveCalc", font=("Arial", 12,))
+        additional_label = Label(loading_screen, text="Always go feet first into CaveCalc", font=FONT_WELCOME_SUB)
         additional_label.pack(expand=True)
         
-        # Function to close the loading screen and call the callback
-        def close_loading_screen():
-            loading_screen.destroy()
-        
-        # Schedule the loading screen to close after 3 seconds
-        loading_screen.after(10000, close_loading_screen)    
+        # Draw it now, before the (slower) input panels are built
+        loading_screen.update_idletasks()
         
     def _loop_gen(self, layout_numbers): 
         ln = layout_numbers
@@ -393,6 +611,12 @@ class CCInputGUI(object):
             ln = [ln] 
         elif type(ln) is not list: 
             raise TypeError("layout_numbers must be int or list of ints.")
+        
+        # the (key, type) list for a layout number never changes, so it is
+        # only generated once.
+        cache_key = tuple(ln)
+        if cache_key in self._loop_cache:
+            return self._loop_cache[cache_key]
     
         # Desired order of variables
         desired_order = [
@@ -412,31 +636,40 @@ class CCInputGUI(object):
         g = [(k, self.layout[k][1]) for k in self.settings.keys() if self.layout[k][0] in ln]
         
         # Sort based on the desired order 
-        return sorted(g, key=lambda tup: desired_order.index(tup[0]) if tup[0] in desired_order else float('inf'))
+        g = sorted(g, key=lambda tup: desired_order.index(tup[0]) if tup[0] in desired_order else float('inf'))
+        self._loop_cache[cache_key] = g
+        return g
          
         
     def get_ln(self, key):
         """Gets the layout index number of 'key'"""
         
-        try:
-            return self.layout[key][1]
-        except KeyError:
-            return self.layout[ns(key)][1]
+        return self._layout_types[key]
         
     def _load_defaults(self):
-    
-        self.d = SettingsObject()
-
-        self.units = vars(cavecalc.data.types_and_limits).copy()
-        self.layout = vars(cavecalc.gui.layout).copy()
         
-        settings = self.d.dict()
-        self.settings = py2tk(settings)
+        self.units = cc_types
+        self.layout = gui_layout
+        self._layout_types = layout_types
+        
+        self.settings = py2tk(default_settings())
+        self._loop_cache = {} # see _loop_gen
+        
+        # settings keys split by whether their input is parsed for ranges of
+        # values. out_dir is handled separately by the run methods.
+        self._parse_keys = frozenset(k for k in self.settings 
+                                     if self.get_ln(k) == 'A')
+        self._noparse_keys = [k for k in self.settings 
+                              if k not in self._parse_keys and k != 'out_dir']
+        self._settings_keys = (self._noparse_keys + 
+                               [k for k in self.settings 
+                                if k in self._parse_keys])
         
     def _browse_file(self, path_variable):  
        """Opens a file dialog to select a file and sets the given StringVar.""" 
-       filename = filedialog.askopenfilename()  
+       filename = filedialog.askopenfilename(initialdir=self._last_dir)  
        if filename: 
+           self._last_dir = os.path.dirname(filename)
            path_variable.set(filename)      
       
     def _plot_CDA(self): 
@@ -461,20 +694,7 @@ class CCInputGUI(object):
     def _show_help(self): 
         """Opens the CDA_help.txt file in the default text viewer.""" 
         try: 
-            # Locate the help file within the cavecalc.gui package using importlib.resources 
-            with importlib.resources.path(cavecalc.gui, 'CDA_help.txt') as help_file_path: 
-                help_file_path_str = str(help_file_path)  # Convert PosixPath to string
-            
-                # Open the file with the default application
-                if subprocess.os.name == 'nt':  # For Windows 
-                   subprocess.run(['start', help_file_path_str], shell=True) 
-                elif subprocess.os.name == 'posix':  # For macOS and Linux 
-                     if 'darwin' in subprocess.os.uname().sysname.lower():  # For macOS 
-                         subprocess.run(['open', help_file_path_str])
-                     else:  # For Linux 
-                         subprocess.run(['xdg-open', help_file_path_str])
-                else: 
-                    print("Unsupported operating system for opening help files.")
+            _open_with_default_app(HELP_FILE)
         except Exception as e: 
             print(f"Error while opening help file: {e}")       
               
@@ -482,91 +702,25 @@ class CCInputGUI(object):
     def construct_inputs(self):
         """Frame 1 contains the left-hand panel of the input GUI."""
 
-        def add_things_to_frame(frame, layout_number, header_text, i, highlight=False, font=None):
+        def add_things_to_frame(frame, layout_number, header_text, i, highlight=False):
             if highlight: 
                 # Create a frame to highlight the section with a dark green border
                 highlight_frame = Frame(frame, bd=2, relief='solid', highlightbackground='green', highlightcolor='green', padx=10, pady=10)
                 highlight_frame.grid(row=i, column=0, columnspan=3, sticky='nsew', pady=5)
                 frame = highlight_frame  # Use the highlighted frame as the current frame
             
-            # Create a dictionary for variable tooltips 
-            tooltips_variables = {
-                #CDA
-                'soil_d13C': 'Sets the stbale carbon isotopic composition of the soil-water and soil-gas. Impacts speleothem d13C', 
-                'soil_pCO2': 'Sets the concentrations of CO2 witin the soil. Alters the extent of bedrock dissolution, and amount of degassing steps. Impacts d13C, d44Ca, DCP, and X/Ca', 
-                'cave_pCO2': 'Sets the concentration of cave air CO2. Alters the amount of degassing and prior carbonate precipitation. Impacts d13C, d44Ca and X/Ca', 
-                'gas_volume': 'Sets the conditions of bedrock dissolution. More open-system conditions is given by a higher gas volume. Impacts DCP and d13C', 
-                'temperature': 'Alters temperature of the cave environment. Impacts fractionation factors of d18O, d13C, and partitioninng coefficients of X/Ca ', 
-                'atm_d18O': 'Sets the rainfall (‰, SMOW) value infilitrating into the karst. Impacts d18O',
-                
-                #Other
-                'atm_O2': 'Sets the atmospheric O2 (given as a decimal fraction)',
-                'atm_pCO2': 'Provides the concentration of atmospheric pCO2. If atmo_exchange > 0, will impact soil-water equilibriation',
-                'atm_d13C': 'Provides the stable carbon isotope composition of atmospheric pCO2. If atmo_exchange > 0, will impact d13C after soil-water equilibriation',
-                'atm_R14C': 'Sets the radiocarbon activity of atmospheric 14C',
-                'soil_O2': 'Sets the percentage of O2 gas within the soil (given as a decimal fraction). If bedrock_pyrite > 0, will impact the amount of pyrite oxidation',
-                'soil_R14C': 'Sets the radiocarbon activity within the soil. Impacts DCP',
-                # Soil Gas Mixing
-                'atmo_exchange': 'Sets the amount of atmospheric excahnge with the soil, impacting soil-water equilibriation',
-                'init_O2':     'A mix of the soil and atm O2. Defines the final soilwater gas O2',  
-                'init_R14C':	'A mix of the soil and atm R14C. Defines final soilwater gas R14C',  	
-                'init_d13C':	'A mix of the soil and atm d13C. Defines final soilwater gas d13C',  	
-                'init_pCO2':	'A mix of the soil and atm pCO2. Defines final soilwater gas pCO2',  	
-                
-                'soil_Ba': 'Alters the amount of Ba provided by the soil. Impacts Ba/Ca',
-                'soil_Ca':  'Alters the amount of Ca provided by the soil. Impacts X/Ca',
-                'soil_Mg':  'Alters the amount of Ca provided by the soil. Impacts Mg/Ca',
-                'soil_Sr': 'Alters the amount of Ca provided by the soil. Impacts Sr/Ca',
-                'soil_U':  'Alters the amount of Ca provided by the soil. Impacts U/Ca',
-                'soil_d44Ca':  'Alters the d44Ca of the soil. Impacts d44Ca',
-                
-                'bedrock_BaCa': 'Alters the amount of Ba provided by the bedrock. Impacts Ba/Ca',
-                'bedrock_Ca':  'Alters the amount of Ca provided by the bedrock. Impacts X/Ca',
-                'bedrock_MgCa':  'Alters the amount of Mg provided by the bedrock. Impacts Mg/Ca',
-                'bedrock_SrCa': 'Alters the amount of Sr provided by the bedrock. Impacts Sr/Ca',
-                'bedrock_UCa':  'Alters the amount of U provided by the bedrock. Impacts U/Ca',
-                'bedrock_d44Ca':  'Alters the d44Ca of the bedrock. Impacts d44Ca',
-                'bedrock_d13C':  'Alters the d13C of the bedrock. Impacts d13C',
-                'bedrock_d18O':  'Alters the d18O of the bedrock. Impacts d18O',
-                
-                
-            
-                # Bedrock Dissolution Conditions
-                'bedrock': 'Alters the amount if bedrock equilibriation with the soil gas. Impacts d13C and DCP',
-                'bedrock_pyrite': 'Alters the amount of pryite available for oxidation. Amount of oxidation also a function of soil_O2. Impacts d13C and DCP',                
-                'reprecip': 'Controls whether re-precipitation can occur. Impacts d13C, d44Ca and X/Ca',
-                
-                # Cave Air   
-                'cave_d13C': 'Alters the stable carbon isotope composition of cave air. NOTE: Default mode does not allow for equilibriaiton with the cave air. To do so, change Degassing/Precipitation Mode to single_step_degassing',
-                'cave_R14C':  'Alters the radiocarbon value of cave air that is equilibriated with the solution R14C. NOTE: Default CaveCalc mode does not allow for equilibriaiton with the cave air. Change Degassing/Precipitation Mode to single_step_degassing to test',
-                'cave_d18O':  'Alters the cave air d18O that is equilibriated with the solution d18O. NOTE: Default CaveCalc mode does not allow for equilibriaiton with the cave air. Change Degassing/Precipitation Mode to single_step_degassing to test',
-                'cave_air_volume': 'Alters the extent of equilibriation with the cave air. NOTE: Default CaveCalc mode does not allow for equilibriaiton with the cave air. Change Degassing/Precipitation Mode to single_step_degassing to test',
-
-                'kinetics_mode': 'Alters fundamental aspects of speleothem chemistry. Refer to Owen et al., 2018: CaveCalc: A new model for speleothem chemistry & isotopes',
-                'precipitate_mineralogy': 'Alters the precipitate mineralogy. Impacts d13C, d18O, X/Ca, and d44Ca',
-          
-                
-                'co2_decrement': 'Fraction of CO2(aq) removed on each degassing step. Alters the resolution of the evolution of d13C, d44Ca, and X/Ca',
-                'calcite_sat_limit': 'Only used when kinetics_mode = ss. CaCO3 only precipitates when saturation index exceeds this value. Impacts d13C, d44Ca, X/Ca and d18O',  
-                
-                'user_filepath': 'File to users measured data, stored in a timer-series', 
-
-
-                
-                }
-            
-            font_style = "-size 13 -weight bold" if highlight else "-size 13"
-            l = Label(frame, text=header_text, font="-size 13")
+            l = Label(frame, text=header_text, font=self._header_font)
             l.grid(row=i,columnspan=2, sticky=SW, pady=3)
             i += 1
             for a, b in self._loop_gen(layout_number):
-                color = 'red' if a in ['soil_d13C', 'soil_pCO2', 'cave_pCO2', 'gas_volume','temperature','atm_d18O'] else 'black'
-                if b == 'A':   
-                    label = Label(frame, text=ns(a), fg=color) 
+                if b != 'C': # options menus carry their own label
+                    color = 'red' if a in HIGHLIGHT_KEYS else 'black'
+                    label = Label(frame, text=ns_name(a), fg=color) 
                     label.grid(row=i, sticky=W) 
+                    # Add tooltip for variable if available 
+                    self._tooltips.register(label, VARIABLE_TOOLTIPS.get(a, 'No information available')) 
                 
-                    Tooltip(label, tooltips_variables.get(a, 'No information available')) 
-                    
+                if b == 'A':   
                     x = InputsRangeWidget(frame, self.settings[a]) 
                     x.grid(row=i, column=1, sticky=W) 
                     
@@ -589,38 +743,22 @@ class CCInputGUI(object):
                         Button(frame, text="→ VPDB", command=convert_to_vpdb).grid(row=i, column=2, sticky=W)
 
                 elif b == 'B': # text without range
-                    label = Label(frame, text=ns(a), fg=color) 
-                    label.grid(row=i, sticky=W) 
-                    # Add tooltip for variable if available 
-                    Tooltip(label, tooltips_variables.get(a, 'No information available'))
                     x = Entry(frame, textvariable=self.settings[a], width=25)
                     x.grid(row=i, column=1, columnspan=2, sticky=W)    
                 elif b == 'C': # options menu
                     
-                    x = OptsWidget( frame, ns(a), self.settings[a], 
+                    x = OptsWidget( frame, ns_name(a), self.settings[a], 
                                     self.units[a], row=i )
                     x.grid(row=i, column=0, sticky=W)
                 elif b == 'D': # check button
-                    label = Label(frame, text=ns(a), fg=color) 
-                    label.grid(row=i, sticky=W) 
-                    # Add tooltip for variable if available 
-                    Tooltip(label, tooltips_variables.get(a, 'No information available'))
                     r = Checkbutton( frame, variable=self.settings[a],
                                      onvalue=True, offvalue=False )
                     r.grid(row=i, column=1)
                 elif b == 'E': # load button
-                    label = Label(frame, text=ns(a), fg=color) 
-                    label.grid(row=i, sticky=W) 
-                    # Add tooltip for variable if available 
-                    Tooltip(label, tooltips_variables.get(a, 'No information available'))
                     f = FileFindWidget( frame, value=self.settings[a], 
                                         mode='load')
                     f.grid(row=i, column=1)
                 elif b == 'F': # save button
-                    label = Label(frame, text=ns(a), fg=color) 
-                    label.grid(row=i, sticky=W) 
-                    # Add tooltip for variable if available 
-                    Tooltip(label, tooltips_variables.get(a, 'No information available'))
                     f = FileFindWidget( frame, value=self.settings[a], 
                                         mode='dir')
                     f.grid(row=i, column=1)
@@ -634,7 +772,7 @@ class CCInputGUI(object):
                 file_paths_frame.grid(row=i + 2, column=0, columnspan=3, pady=5)
                 
                 # Add heading
-                heading = Label(file_paths_frame, text="Plot CDA results vs measured data", font="-size 12 -weight bold")
+                heading = Label(file_paths_frame, text="Plot CDA results vs measured data", font=self._heading_font)
                 heading.grid(row=0, column=0, columnspan=2, pady=10)
 
 
@@ -660,6 +798,10 @@ class CCInputGUI(object):
                 frame.grid_forget()
                 self.toggle_buttons[section_name].config(text=f"▼ {section_name}")
             else: 
+                # Section contents are built the first time it is expanded
+                if section_name not in self._built_sections:
+                    self._section_builders[section_name]()
+                    self._built_sections.add(section_name)
                 frame.grid(row=row_indices[section_name], column=0, sticky='nsew')
                 self.toggle_buttons[section_name].config(text=f"▲ {section_name}")
         
@@ -687,12 +829,14 @@ class CCInputGUI(object):
         # Initialize dictionaries only once
         self.expandable_frames = {}
         self.toggle_buttons = {}
+        self._section_builders = {}
+        self._built_sections = set()
         row_indices = {}
 
         # Create Frame 1 with collapsible sections
 
         F1 = Frame(self.master)
-        Label(F1, text='', font="-size 12 -weight bold").grid(row=0, columnspan=3)
+        F1.grid_rowconfigure(0, minsize=TOP_ROW_HEIGHT)
     
 
         section_names = [
@@ -711,15 +855,17 @@ class CCInputGUI(object):
                 i = add_things_to_frame(F1, 4, 'File IO Settings', current_row) 
             else: 
                 # Add toggle button
-                self.toggle_buttons[section_name] = Button(F1, text=f"▼ {section_name}", command=lambda s=section_name: toggle_expand_collapse(s))
+                self.toggle_buttons[section_name] = Button(F1, text=f"▼ {section_name}", command=partial(toggle_expand_collapse, section_name))
                 self.toggle_buttons[section_name].grid(row=current_row, column=0, sticky=W) 
                 
                 # Create expandable frame for the section
                 self.expandable_frames[section_name] = Frame(F1) 
                 current_row += 1 
                 
-                # Add section contenrt 
-                i = add_things_to_frame(self.expandable_frames[section_name], layout_number, section_name, 0, highlight=True, font="-size 13 -weight bold") 
+                # Add section content (built on first expand)
+                self._section_builders[section_name] = partial(
+                    add_things_to_frame, self.expandable_frames[section_name],
+                    layout_number, section_name, 0, highlight=True)
                 row_indices[section_name] = current_row 
                 
                 # Increment the row for the next section
@@ -729,7 +875,7 @@ class CCInputGUI(object):
 
         # Create Frame 3 with collapsible sections
         F2 = Frame(self.master)
-        Label(F2, text='', font="-size 12 -weight bold").grid(row=0, columnspan=3)
+        F2.grid_rowconfigure(0, minsize=TOP_ROW_HEIGHT)
     
 
         section_names = [
@@ -742,17 +888,19 @@ class CCInputGUI(object):
         current_row =1
         for section_name, layout_number in section_names: 
             # Add toggle button
-            self.toggle_buttons[section_name] = Button(F2, text=f"▼ {section_name}", command=lambda s=section_name: toggle_expand_collapse(s))
+            self.toggle_buttons[section_name] = Button(F2, text=f"▼ {section_name}", command=partial(toggle_expand_collapse, section_name))
             self.toggle_buttons[section_name].grid(row=current_row, column=0, sticky=W)
                       
             # Create tooltip for toggle button
-            #Tooltip(self.toggle_buttons[section_name], tooltips.get(section_name, 'No information available'))
+            #self._tooltips.register(self.toggle_buttons[section_name], tooltips.get(section_name, 'No information available'))
             # Create expandable frame for the section
             self.expandable_frames[section_name] = Frame(F2)
             current_row += 1
 
-            # Add section content
-            i = add_things_to_frame(self.expandable_frames[section_name], layout_number, section_name, 0, highlight=True, font="-size 13 -weight bold")
+            # Add section content (built on first expand)
+            self._section_builders[section_name] = partial(
+                add_things_to_frame, self.expandable_frames[section_name],
+                layout_number, section_name, 0, highlight=True)
             row_indices[section_name] = current_row
 
             # Increment the row for the next section
@@ -765,7 +913,7 @@ class CCInputGUI(object):
 
         # Create Frame 3 with collapsible sections
         F3 = Frame(self.master)
-        Label(F3, text='', font="-size 12 -weight bold").grid(row=0, columnspan=3)
+        F3.grid_rowconfigure(0, minsize=TOP_ROW_HEIGHT)
     
 
         # Define sections
@@ -782,18 +930,20 @@ class CCInputGUI(object):
             button_color = 'red' if section_name in ['Aragonite/Calcite Mode', 'CDA Mode'] else 'black'
 
             # Add toggle button
-            self.toggle_buttons[section_name] = Button(F3, text=f"▼ {section_name}", command=lambda s=section_name: toggle_expand_collapse(s))
+            self.toggle_buttons[section_name] = Button(F3, text=f"▼ {section_name}", command=partial(toggle_expand_collapse, section_name))
             self.toggle_buttons[section_name].grid(row=current_row, column=0, sticky=W)
            
             # Create tooltip for toggle button
-            #Tooltip(self.toggle_buttons[section_name], tooltips.get(section_name, 'No information available'))
+            #self._tooltips.register(self.toggle_buttons[section_name], tooltips.get(section_name, 'No information available'))
            
             # Create expandable frame for the section
             self.expandable_frames[section_name] = Frame(F3)
             current_row += 1
 
-            # Add section content
-            i = add_things_to_frame(self.expandable_frames[section_name], layout_number, section_name, 0, highlight=True, font="-size 13 -weight bold")
+            # Add section content (built on first expand)
+            self._section_builders[section_name] = partial(
+                add_things_to_frame, self.expandable_frames[section_name],
+                layout_number, section_name, 0, highlight=True)
             row_indices[section_name] = current_row
             
             
@@ -802,7 +952,8 @@ class CCInputGUI(object):
         
         
         # Add Run button 
-        RunButton = Button(F3, text="Run CaveCalc only!", command=lambda: self._run_models()) 
+        i = current_row
+        RunButton = Button(F3, text="Run CaveCalc only!", command=self._run_models) 
         RunButton.grid(row=i, column=0, sticky=W, padx=0, pady=(35, 1))
         
         RunCDAButton = Button(F3, text="Run CaveCalc with CDA!", command=self.run_models_CDA) 
@@ -810,32 +961,49 @@ class CCInputGUI(object):
         
      
         # Add link to output GUI
-        LinkButton = Button(F3, text="CaveCalc Output", command=lambda: CCAnalyseGUI(Toplevel(self.master)))
+        LinkButton = Button(F3, text="CaveCalc Output", command=self.open_output_gui)
         LinkButton.grid(row=i + 2, column=0, sticky=W, padx=0, pady=2)  # Place below the Run buttons
    
         
        
         F3.pack(side='left', anchor='n', padx=px, pady=py)  
         self.F3 = F3
+        
+        # single geometry pass for the whole window
+        self.master.update_idletasks()
     
     
+    def open_output_gui(self):
+        """Open the Cavecalc output GUI window."""
+        CCAnalyseGUI(Toplevel(self.master))
+        
     def open_CDA_gui(self):
         """Open the CDA GUI window."""
         CDAGUI(Toplevel(self.master), self)   
         
-    def _run_models(self):
+    def _collect_settings(self):
+        """Convert the current GUI inputs to a ForwardModels settings dict.
         
-        s = self.settings.copy()
-        out_dir = s.pop('out_dir').get()
-        d = {}
+        All values are fetched with a single Tcl call. Numeric inputs (layout
+        type 'A') are parsed into lists of values; 'out_dir' is excluded.
+        """
         
-        d1 = {k:v for (k,v) in s.items() if self.get_ln(k) != 'A'}
-        d2 = {k:v for (k,v) in s.items() if self.get_ln(k) == 'A'}
+        s = self.settings
+        keys = [k for k in self._settings_keys if s[k] is not None]
+        vals = bulk_get([s[k] for k in keys])
         
-        d1 = ns(tk2py(d1, parse=False))
-        d2 = ns(tk2py(d2, parse=True))
+        d = {}
+        for k, val in zip(keys, vals):
+            if k in self._parse_keys and isinstance(val, str):
+                val = _parse_value_input(val)
+            if val is not None:
+                d[k] = val
+        return ns(d)
+        
+    def _run_models(self):
         
-        d = {**d1, **d2}
+        out_dir = self.settings['out_dir'].get()
+        d = self._collect_settings()
 
         p = cavecalc.forward_models.ForwardModels(settings=d, 
                                                   output_dir=out_dir)
@@ -855,17 +1023,8 @@ class CCInputGUI(object):
 
     
     def run_rainfall_calculator(self):  
-        s = self.settings.copy()
-        out_dir = s.pop('out_dir').get()
-        d = {}
-        
-        d1 = {k:v for (k,v) in s.items() if self.get_ln(k) != 'A'}
-        d2 = {k:v for (k,v) in s.items() if self.get_ln(k) == 'A'}
-        
-        d1 = ns(tk2py(d1, parse=False))
-        d2 = ns(tk2py(d2, parse=True))
-        
-        d = {**d1, **d2}
+        out_dir = self.settings['out_dir'].get()
+        d = self._collect_settings()
 
         p = cavecalc.forward_models.ForwardModels(settings=d, 
                                                   output_dir=out_dir)
@@ -875,8 +1034,7 @@ class CCInputGUI(object):
     def run_models_CDA(self): 
         """Run the CDA models with additional checks."""
     
-        # Copy settings
-        s = self.settings.copy()
+        s = self.settings
     
         # Check if user_filepath is specified
         user_filepath = s.get('user_filepath').get()  # Access 'user_filepath' from settings
@@ -885,19 +1043,8 @@ class CCInputGUI(object):
             messagebox.showwarning("Warning", "User needs to specify input file in CDA Settings") 
             return  # Exit the method if user_filepath is not specified
     
-        out_dir = s.pop('out_dir').get()  # Pop out_dir from settings
-        d = {}
-    
-        # Split settings into two categories based on layout number
-        d1 = {k: v for k, v in s.items() if self.get_ln(k) != 'A'}
-        d2 = {k: v for k, v in s.items() if self.get_ln(k) == 'A'}
-    
-        # Convert settings from Tkinter to Python
-        d1 = ns(tk2py(d1, parse=False))
-        d2 = ns(tk2py(d2, parse=True))
-    
-        # Merge dictionaries
-        d = {**d1, **d2}
+        out_dir = s['out_dir'].get()
+        d = self._collect_settings()
     
         # Run models
         p = cavecalc.forward_models.ForwardModels(settings=d, output_dir=out_dir)
@@ -912,17 +1059,26 @@ class CDAGUI(object):
     def __init__(self, master, cc_input_gui):
         self.master = master
         self.master.title('CDA')
+        self._last_dir = os.getcwd()
+        self._heading_font = cc_input_gui._heading_font # shared named font
         self.CDA_input_path = StringVar()
         self.CDA_path = StringVar()
         self.file_paths_frame()  # Add the file paths frame
         self.construct_inputs()  # Add the CDA inputs
+        self.master.protocol("WM_DELETE_WINDOW", self._on_close)
+        
+    def _on_close(self):
+        """Close the window and release its Tk variables."""
+        
+        self.master.destroy()
+        del self.CDA_input_path, self.CDA_path
         
     def file_paths_frame(self): 
         """Frame for inputting file paths for CDA data.""" 
         F2 = Frame(self.master)
         
         # Add heading
-        heading = Label(F2, text="Plot CDA results vs measured data", font="-size 12 -weight bold")
+        heading = Label(F2, text="Plot CDA results vs measured data", font=self._heading_font)
         heading.grid(row=0, column=0, columnspan=2, pady=10)
 
         # Use FileFindWidget for CDA input path
@@ -944,8 +1100,9 @@ class CDAGUI(object):
     
     def _browse_file(self, path_variable):  
        """Opens a file dialog to select a file and sets the given StringVar.""" 
-       filename = filedialog.askopenfilename()  
+       filename = filedialog.askopenfilename(initialdir=self._last_dir)  
        if filename: 
+           self._last_dir = os.path.dirname(filename)
            path_variable.set(filename)      
     
     def _plot_CDA(self): 
@@ -969,20 +1126,7 @@ class CDAGUI(object):
     def _show_help(self): 
         """Opens the CDA_help.txt file in the default text viewer.""" 
         try: 
-            # Locate the help file within the cavecalc.gui package using importlib.resources 
-            with importlib.resources.path(cavecalc.gui, 'CDA_help.txt') as help_file_path: 
-                help_file_path_str = str(help_file_path)  # Convert PosixPath to string
-            
-                # Open the file with the default application
-                if subprocess.os.name == 'nt':  # For Windows 
-                   subprocess.run(['start', help_file_path_str], shell=True) 
-                elif subprocess.os.name == 'posix':  # For macOS and Linux 
-                     if 'darwin' in subprocess.os.uname().sysname.lower():  # For macOS 
-                         subprocess.run(['open', help_file_path_str])
-                     else:  # For Linux 
-                         subprocess.run(['xdg-open', help_file_path_str])
-                else: 
-                    print("Unsupported operating system for opening help files.")
+            _open_with_default_app(HELP_FILE)
         except Exception as e: 
             print(f"Error while opening help file: {e}")
             
@@ -990,16 +1134,7 @@ class CDAGUI(object):
     def _open_file(self, file_path): 
         """Opens a file with the default application based on the operating system."""
         try: 
-            # Open the file with the default application 
-            if subprocess.os.name == 'nt':  # For Windows 
-               subprocess.run(['start', file_path], shell=True) 
-            elif subprocess.os.name == 'posix':  # For macOS and Linux 
-                 if 'darwin' in subprocess.os.uname().sysname.lower():  # For macOS 
-                    subprocess.run(['open', file_path])
-                 else:  # For Linux
-                    subprocess.run(['xdg-open', file_path])
-            else: 
-                print("Unsupported operating system for opening files.")
+            _open_with_default_app(file_path)
         except Exception as e: 
             print(f"Error while opening file: {e}")  
 
@@ -1013,10 +1148,11 @@ class CCAnalyseGUI(object):
         self.e = Evaluate()
         self.dir = StringVar()
         self.dir.set(os.getcwd())
+        self._last_dir = os.getcwd()
         self.loaded_dirs = []
-        self.dnum = IntVar() # total no of models loaded
-        self.dnum.set(0)
-        self.settings_report = {}
+        self.settings_report = None # cached by get_report()
+        self._save_queue = queue.Queue() # results of background saves
+        self.plot_window = None # see open_plotting_window
         
         # File paths for the CDA
         self.CDA_input_path = StringVar()
@@ -1025,53 +1161,137 @@ class CCAnalyseGUI(object):
         self.load_outputs_frame()
         self.save_buttons_frame()
         #self.file_paths_frame()  # Adding the file path input frame
+        self.master.protocol("WM_DELETE_WINDOW", self._on_close)
+        
+    def _on_close(self):
+        """Close the window and drop the loaded model data and Tk variables."""
+        
+        self.e = None
+        self.loaded_dirs.clear()
+        self.settings_report = None
+        self.plot_window = None
+        self.master.destroy()
+        del self.dir, self.CDA_input_path, self.CDA_path
         
        
         
     def _csv_dir_save(self):
-        d = filedialog.askdirectory()
+        d = filedialog.askdirectory(initialdir=self._last_dir)
         if d:
-            self.e.save_csvs(d)
+            self._last_dir = d
+            self._start_save(self.e.save_csvs, d)
         
     def _mat_save(self):
-        d = filedialog.asksaveasfilename()
+        d = filedialog.asksaveasfilename(initialdir=self._last_dir)
         if d:
-            self.e.save_all_mat(file=d)
+            self._last_dir = os.path.dirname(d)
+            self._start_save(self.e.save_all_mat, d)
+            
+    def _start_save(self, func, *args):
+        """Run a save method in a background thread so the GUI stays live.
+        
+        The load and save buttons are disabled until the save completes. If
+        the window is closed first, the program exits once the save is done.
+        """
+        
+        for b in self._io_buttons:
+            b.config(state=DISABLED)
+        
+        def worker():
+            try:
+                func(*args)
+                self._save_queue.put(None)
+            except Exception as e:
+                self._save_queue.put(e)
+        
+        # not a daemon thread, so closing the GUI does not cut a save short
+        threading.Thread(target=worker).start()
+        self.master.after(100, self._drain_save_queue)
+        
+    def _drain_save_queue(self):
+        """Poll for the result of a background save (see _start_save)."""
+        
+        if self.e is None: # window closed
+            return
+        try:
+            err = self._save_queue.get_nowait()
+        except queue.Empty:
+            self.master.after(100, self._drain_save_queue)
+            return
+        
+        for b in self._io_buttons:
+            b.config(state=NORMAL)
+        if err is None:
+            print("Saved.")
+        else:
+            messagebox.showerror("Error", "Save failed: %s" % err)
             
     def _add_data(self):
         """Loads data from the currently selected directory."""
-        d = filedialog.askdirectory()
+        d = filedialog.askdirectory(initialdir=self._last_dir)
         
         if d:
+            self._last_dir = d
             if d not in self.loaded_dirs:
                 self.e.load_data(d)
-                self.dnum.set(len(self.e.model_results))
+                self.dnum_label.config(text=str(len(self.e.model_results)))
                 self.loaded_dirs.append(d)
+                self.settings_report = None
+                
+    def open_plotting_window(self):
+        """Show the plotting window, only rebuilding it if data has changed.
+        
+        An open window is reused as long as it was built from the current
+        settings report. Otherwise it is closed and a new one is made.
+        """
+        
+        w = self.plot_window
+        if w is not None and w.winfo_exists():
+            if w.report is self.get_report():
+                w.deiconify()
+                w.lift()
+                return
+            w._on_close()
+        self.plot_window = PlottingWindow(self)
+        
+    def get_report(self):
+        """Return the settings report for the loaded data.
+        
+        The report is only rebuilt after new data has been loaded.
+        """
+        
+        if self.settings_report is None:
+            self.settings_report = self.e.get_settings_report()
+        return self.settings_report
         
     def load_outputs_frame(self):
         F0 = Frame(self.master)
         
         b = Button(master=F0, text="Load Model Output",
-                   command = lambda : self._add_data())
+                   command = self._add_data)
         b.grid(row=0, column=0, columnspan=2)
+        self._io_buttons = [b]
         
         Label(F0, text="Models Loaded").grid(row=1, column=0, sticky=W)
         
-        t1 = Entry(master=F0, textvariable=self.dnum, state='readonly')
-        t1.grid(row=1,column=1)        
+        # total no of models loaded
+        self.dnum_label = Label(F0, text='0', width=20, anchor=W, 
+                                relief='sunken')
+        self.dnum_label.grid(row=1,column=1)        
         F0.pack()
                   
     def save_buttons_frame(self):
         F1 = Frame(self.master)
         
         b1 = Button(master=F1, text="save as .csv", 
-                    command = lambda : self._csv_dir_save())
+                    command = self._csv_dir_save)
         b1.grid(row=0, column=0)
         b2 = Button(master=F1, text="save as .mat", 
-                    command = lambda : self._mat_save())
+                    command = self._mat_save)
         b2.grid(row=0, column=1)
+        self._io_buttons += [b1, b2]
         b3 = Button(master=F1, text='Open Plotting Window',
-                    command = lambda : PlottingWindow(self))
+                    command = self.open_plotting_window)
         b3.grid(row=0, column=2)
         
         F1.pack()
@@ -1080,6 +1300,14 @@ class CCAnalyseGUI(object):
 
 
         
+# plot filter radio button value -> function returning filtered Evaluate data
+PLOT_FILTERS = {
+    1 : lambda e: e.filter_by_index(ind=0, n=True), # excl. initial solution
+    2 : lambda e: e.filter_by_index(ind=1),         # bedrock dissolution
+    3 : lambda e: e.filter_by_index(ind=-1),        # end point
+    4 : lambda e: e.filter_by_results('step_desc', 'precip'), # precipitation
+    }
+
 class PlottingWindow(Toplevel):
     def __init__(self, CCAnalyseGUI):
         super().__init__(CCAnalyseGUI.master)
@@ -1087,10 +1315,12 @@ class PlottingWindow(Toplevel):
         
         
         self.e = CCAnalyseGUI.e
-        self.b = Evaluate()
-        self.o = self.e.model_results[0]
-        self.s = self.e.model_settings[0]
-        self.report = self.e.get_settings_report()
+        self.loaded_dirs = CCAnalyseGUI.loaded_dirs
+        self._filtered_key = None # see filtered()
+        self._filtered_data = None
+        self._labels = {} # see label_values()
+        self.output_keys = sorted_options(self.e.output_names())
+        self.report = CCAnalyseGUI.get_report()
         
         lx = Label(self, text = "X variable (Required)")
         ly = Label(self, text = "Y variable (Required)")
@@ -1129,60 +1359,83 @@ class PlottingWindow(Toplevel):
                             
         b = self.PlotButton()
         b.grid(row=8,columnspan=2)
+        self.protocol("WM_DELETE_WINDOW", self._on_close)
+        
+    def _on_close(self):
+        """Close the window and drop its references to the model data."""
+        
+        self.e = self.output_keys = self.report = None
+        self._filtered_data = None
+        self._labels = {}
+        self.destroy()
+        del self.x, self.y, self.l, self.v
 
     def SettingSelectWidget(self):
         v = StringVar()
-        opt = list(self.report.keys())
-        if HIDDEN_OPTS:
-            opt = [o for o in opt if o not in HIDDEN_OPTS]
-        
-        o = []
-        for entry in opt:
-            try:
-                o.append(ns(entry))
-            except KeyError:
-                o.append(entry)
-        return OptionMenu(self, v, *sorted(o)), v
+        o = setting_options(tuple(self.report.keys()))
+        return ttk.Combobox(self, textvariable=v, values=o, 
+                            state='readonly'), v
         
     def OutputSelectWidget(self):
         v = StringVar()
-        opt = list(self.o.keys())
-        return OptionMenu(self, v, *sorted(opt)), v
+        return ttk.Combobox(self, textvariable=v, values=self.output_keys, 
+                            state='readonly'), v
     
     def PlotButton(self):
 
         b = Button(self, text='Plot Graph', 
-                    command = lambda : self.plot())
+                    command = self.plot)
         return b
         
+    def filtered(self, option):
+        """Return the data for a filter option.
+        
+        Only the most recent option is kept, so replotting with the same
+        filter reuses it. It is rebuilt when more data is loaded into the
+        output GUI.
+        """
+        
+        key = (option, len(self.loaded_dirs))
+        if key != self._filtered_key:
+            filt = PLOT_FILTERS.get(option)
+            if filt is None:
+                # read-only use in plot, so no copy is needed
+                a = self.e
+            else:
+                a = filt(self.e)
+            self._filtered_key = key
+            self._filtered_data = a
+            self._labels = {}
+        return self._filtered_data
+        
+    def label_values(self, option, lab_name):
+        """Return the label values for a filter option and setting name.
+        
+        ns_name(lab_name) is resolved once, and the values are cached
+        alongside the current filtered data (see filtered).
+        """
+        
+        a = self.filtered(option)
+        if lab_name not in self._labels:
+            self._labels[lab_name] = a.get_setting_values(ns_name(lab_name))
+        return self._labels[lab_name]
+        
     def plot(self): 
 
-        if self.v.get() == 1:
-            a = self.e.filter_by_index(ind=0, n=True)
-        elif self.v.get() == 2:
-            a = self.e.filter_by_index(ind=1)
-        elif self.v.get() == 3:
-            a = self.e.filter_by_index(ind=-1)
-        elif self.v.get() == 4:
-            a = self.e.filter_by_results('step_desc', 'precip')
-            
-            
-        else:
-            a = copy.deepcopy(self.e)
-           
+        option = self.v.get()
         f = lambda x : None if x == '' else x
         x_lab = f(self.x.get())
         y_lab = f(self.y.get())
         lab_name = f(self.l.get())
         
-        x = []
-        y = []
-        for v in a.model_results:
-            x.append(v[x_lab])
-            y.append(v[y_lab])
+        a = self.filtered(option)
+        
+        # only the plotted data is copied out of the Evaluate object
+        x = a.get_outputs(x_lab)
+        y = a.get_outputs(y_lab)
         
         if lab_name:
-            labs = [s[ns(lab_name)] for s in a.model_settings]       
+            labs = self.label_values(option, lab_name)
         else:
             labs = None
         
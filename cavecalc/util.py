@@ -5,18 +5,40 @@ other helpful bits.
 """
 
 import os
+import atexit
 import datetime
 import math
 import pickle
 import pandas as pd
 import csv
 import re
+import weakref
 from collections import OrderedDict
-from copy import copy
+from functools import lru_cache
 import numpy as np
 import scipy.io as sio
 import cavecalc.data
 
+# Size limit for DBReader's temperature-keyed caches
+CACHE_SIZE = 4096
+
+def _cache_get(cache, key):
+    """Return cache[key] (or None), marking it most recently used."""
+    
+    try:
+        cache.move_to_end(key)
+    except KeyError:
+        return None
+    return cache[key]
+    
+def _cache_put(cache, key, value, cap=CACHE_SIZE):
+    """Add an entry to an OrderedDict cache, evicting the least recently
+    used entry when the cache is full."""
+    
+    cache[key] = value
+    if len(cache) > cap:
+        cache.popitem(last=False)
+
 class DBReader(object):
     """Reads data from the PHREEQC database file.
     
@@ -25,8 +47,8 @@ class DBReader(object):
     geochemical calculations coded in caves.py. Thermodynamic parameters are
     not hard-coded into Cavecalc python files.
     
-    DBReader objects cache use regular expressions to parse the database file 
-    and cache data extracted to improve performance on repeated requests.
+    DBReader objects read the database file once into an in-memory index and
+    cache data extracted to improve performance on repeated requests.
     
     Selected Methods:
         get_k_values - get phase definition thermodynamic data
@@ -45,12 +67,91 @@ class DBReader(object):
         db_dir = os.path.dirname(cavecalc.data.__file__)
         self.db = os.path.join(db_dir,database)
         
-        self.alphas = {}
-        self.thermo = {}
+        # cached results, keyed on the lookup arguments and temperature
+        self.alphas = OrderedDict()
+        self.thermo = OrderedDict()
+        
+        # parsed database blocks, keyed on the lookup arguments
+        self._phase_block_cache = {}
+        self._ne_block_cache = {}
+        
+        # in-memory index of the database file, built on first lookup
+        self._db_lines = None
+        self._phase_index = None
+        self._ne_index = None
+        self._iso_index = None
+        
+        # analytic expression coefficients and temperature basis vectors
+        self._coeff_cache = {}
+        self._basis_cache = OrderedDict()
+        
+        # -add_logk dependencies and own expressions of each fractionation
+        # factor, keyed on (isotope, species)
+        self._alpha_deps = {}
+        self._alpha_coeffs = {}
+        
+        # get_alpha and get_iso_stnd results
+        self._alpha_cache = OrderedDict()
+        self._iso_stnd_cache = {}
         
     def _cc(self, line):
         return line.split('#')[0]
         
+    def _ensure_index(self):
+        """Read the database file once and index the lines needed by the
+        lookup methods.
+        
+        Reaction lines (containing '=') are indexed on their left hand side,
+        named expression headers on their name and '-isotope' lines on the
+        isotope. Where a key occurs more than once the first reaction / 
+        expression and the last isotope line are kept, matching the order 
+        in which the file was previously scanned.
+        """
+        
+        if self._db_lines is not None:
+            return
+            
+        with open(self.db, 'r') as f:
+            lines = f.read().splitlines()
+            
+        phases = {}
+        nes = {}
+        isos = {}
+        for i, line in enumerate(lines):
+            # substring checks skip most lines before any splitting
+            if '=' in line:
+                code = self._cc(line)
+                if '=' in code:
+                    lhs = ' '.join(code.split('=')[0].split())
+                    phases.setdefault(lhs, i)
+                    continue
+            if 'Log_alpha_' in line:
+                s = line.split()
+                if s[0].startswith('Log_alpha_'):
+                    nes.setdefault(s[0], i)
+            elif '-isotope' in line:
+                s = line.split()
+                if s[0] == '-isotope' and len(s) > 3:
+                    isos[s[1].strip('[]')] = s
+                    
+        self._db_lines = lines
+        self._phase_index = phases
+        self._ne_index = nes
+        self._iso_index = isos
+        
+    def _read_block(self, i):
+        """Return the parsed data lines following line i of the database."""
+        
+        lines = self._db_lines
+        out = []
+        j = i + 1
+        while j < len(lines) and lines[j].strip() not in ('', '#'):
+            a = self._cc(lines[j].strip()).split()
+            if a:
+                out.append(a)
+            j += 1
+        return out
+        
     def _database_eval(self, equation, temperature): 
         """Evaluate a database expression for a fractionation factor or
         partition coefficent.
@@ -64,60 +165,50 @@ class DBReader(object):
             Value of the expression at the given temperature
         """
         T = temperature
-        a = equation
         
-        coeffs = [1, T, 1/T, math.log10(T), 1/(T*T), T*T]        
-        evaluation = 0
-        for i in range(len(a)):
-            evaluation += float(a[i])*float(coeffs[i])   # compute 1000ln_alpha
-        return evaluation
+        key = tuple(equation)
+        a = self._coeff_cache.get(key)
+        if a is None:
+            a = np.asarray(key, dtype=np.float64)
+            self._coeff_cache[key] = a
+            
+        basis = _cache_get(self._basis_cache, T)
+        if basis is None:
+            basis = np.array([1, T, 1/T, math.log10(T), 1/(T*T), T*T],
+                             dtype=np.float64)
+            _cache_put(self._basis_cache, T, basis)
+        return float(np.dot(a, basis[:len(a)]))   # compute 1000ln_alpha
             
     def _phase_lookup(self, reactants_list):
         
         r = r' \+ '.join(reactants_list)
-        rc1 = re.compile(r"\s*?{}\s*=".format(r))
+        key = tuple(reactants_list)
+        if key in self._phase_block_cache:
+            return self._phase_block_cache[key]
             
-        out = []
-        
-        with iter(open(self.db, 'r')) as f:
-            for line in f:
-                if re.match(rc1, line):
-                    line = next(f)
-                    while line.strip() not in ('', '#'):
-                        a = self._cc(line.strip()).split()
-                        out.append(copy(a))
-                        line = next(f)
-                    return [o for o in out if o]
-        raise Exception("No PHASES entry matched: %s" % r)
+        # reactants are given as regex-escaped species names
+        self._ensure_index()
+        lhs = re.sub(r'\\(.)', r'\1', ' + '.join(reactants_list))
+        if lhs not in self._phase_index:
+            raise Exception("No PHASES entry matched: %s" % r)
+        out = self._read_block(self._phase_index[lhs])
+        self._phase_block_cache[key] = out
+        return out
         
     def _ne_lookup(self, isotope, species):
         
-        def escape_brackets(string):
-            s = string.replace(r'(', r'\(')
-            s = s.replace(r')',r'\)')
-            s = s.replace(r'\\)',r'\)')
-            s = s.replace(r'\\(',r'\(')
-            s = s.replace(r'\[',r'[')
-            s = s.replace(r'\]',r']')
-            return s
-        
-        isotope = escape_brackets(isotope)
-        species = escape_brackets(species)
+        key = (isotope, species)
+        if key in self._ne_block_cache:
+            return self._ne_block_cache[key]
             
-        r1 = r"\s*Log_alpha_{}_{}\s*".format(isotope, species)
-        rc1 = re.compile(r1)
-        out = []
-        
-        with iter(open(self.db, 'r')) as f:
-            for line in f:
-                if re.match(rc1, line):
-                    line = next(f)
-                    while line.strip() not in ('', '#'):
-                        a = self._cc(line.strip()).split()
-                        out.append(copy(a))
-                        line = next(f)
-                    return [o for o in out if o]
-        raise Exception("No NAMED EXPRESSIONS entry matched: %s" % r1)
+        self._ensure_index()
+        name = "Log_alpha_{}_{}".format(isotope, species)
+        name = re.sub(r'\\(.)', r'\1', name)
+        if name not in self._ne_index:
+            raise Exception("No NAMED EXPRESSIONS entry matched: %s" % name)
+        out = self._read_block(self._ne_index[name])
+        self._ne_block_cache[key] = out
+        return out
                 
     def get_k_values(self, reactants_list, temperature=298.15):
         """Get thermodynamic data for a specified phase.
@@ -151,11 +242,10 @@ class DBReader(object):
             temperature = temperature + 273.15
     
         # If possible return cached values
-        chk = reactants_list.copy()
-        chk.append(str(temperature))
-        chk = ' '.join(chk)
-        if chk in self.thermo:
-            return self.thermo[chk]
+        chk = tuple(reactants_list) + (round(temperature, 6),)
+        thermo = _cache_get(self.thermo, chk)
+        if thermo is not None:
+            return thermo
             
         thermo = {}
         data = self._phase_lookup(reactants_list)
@@ -171,7 +261,7 @@ class DBReader(object):
                 thermo['analytic_value'] = self._database_eval( a[1:], 
                                                                 temperature )
         
-        self.thermo[chk] = thermo
+        _cache_put(self.thermo, chk, thermo)
         return thermo
                 
     def get_1000lnalpha(self, isotope, species, temperature=298.15):
@@ -195,22 +285,66 @@ class DBReader(object):
             temperature = temperature + 273.15
             
         # Check for cached value
-        chk = isotope + species + str(temperature)
-        if chk in self.alphas:
-            return self.alphas[chk]
+        tk = round(temperature, 6)
+        chk = (isotope, species, tk)
+        value = _cache_get(self.alphas, chk)
+        if value is not None:
+            return value
+        
+        # Evaluate the -add_logk dependencies depth first, children before
+        # parents, so each expression is evaluated once per temperature.
+        # 'visiting' holds the nodes on the current dependency path.
+        stack = [(isotope, species)]
+        visiting = set()
+        while stack:
+            node = stack[-1]
+            if _cache_get(self.alphas, node + (tk,)) is not None:
+                stack.pop()
+                continue
+            deps = self._alpha_node(*node)
+            values = [_cache_get(self.alphas, c + (tk,)) for c, _ in deps]
+            pending = [c for (c, _), v in zip(deps, values) if v is None]
+            if pending:
+                if any(c in visiting for c in pending):
+                    raise Exception("Circular -add_logk definition: %s %s" 
+                                    % node)
+                visiting.add(node)
+                stack.extend(pending)
+                continue
+            
+            value = 0
+            for a in self._alpha_coeffs[node]:
+                value += self._database_eval(a, temperature)
+            for (c, n), v in zip(deps, values):
+                value += v * n
+            _cache_put(self.alphas, node + (tk,), value)
+            visiting.discard(node)
+            stack.pop()
+        return value
         
+    def _alpha_node(self, isotope, species):
+        """Return the -add_logk dependencies of a fractionation factor.
         
-        value = 0
-        tmp = self._ne_lookup(isotope, species)
+        The dependencies are returned as a list of ((isotope, species), 
+        multiplier) tuples. The factor's own -ln_alpha1000 expressions are 
+        stored in self._alpha_coeffs.
+        """
         
-        for a in tmp:
+        node = (isotope, species)
+        if node in self._alpha_deps:
+            return self._alpha_deps[node]
+            
+        deps = []
+        coeffs = []
+        for a in self._ne_lookup(isotope, species):
             if a[0] == '-add_logk':
                 b = a[1].split('_')
-                value += self.get_1000lnalpha(b[2], b[3], temperature)*int(a[2])
+                deps.append(((b[2], b[3]), int(a[2])))
             elif a[0] == '-ln_alpha1000':
-                value += self._database_eval(a[1:], temperature)                
-        self.alphas[chk] = value   
-        return value
+                coeffs.append(a[1:])
+        self._alpha_deps[node] = deps
+        self._alpha_coeffs[node] = coeffs
+        return deps
          
    
     def get_alpha(self, isotope, species, temperature=298.15):
@@ -229,8 +363,13 @@ class DBReader(object):
             alpha for the reaction.
         """
     
-        ln1000a = self.get_1000lnalpha(isotope, species, temperature=298.15)
-        return math.exp(0.001*ln1000a)
+        chk = (isotope, species, round(temperature, 6))
+        alpha = _cache_get(self._alpha_cache, chk)
+        if alpha is None:
+            ln1000a = self.get_1000lnalpha(isotope, species, temperature)
+            alpha = math.exp(0.001*ln1000a)
+            _cache_put(self._alpha_cache, chk, alpha)
+        return alpha
     
     def get_iso_stnd(self, isotope):
         """Get the absolute isotope ratio in the standard.
@@ -245,19 +384,16 @@ class DBReader(object):
             The mole fraction of 'isotope' present in the standard.
         """
         
-        a = None
-        pat = r"([ \t]*?)-isotope([ \t]*?)\[{!s}\][ \t]"
-        c = re.compile(pat.format(isotope))
-        with open(self.db, 'r') as f:
-            for line in f:
-                if re.match(c, line):
-                    a = line
-                    
-        if a is None:
+        if isotope in self._iso_stnd_cache:
+            return self._iso_stnd_cache[isotope]
+            
+        self._ensure_index()
+        if isotope not in self._iso_index:
             raise Exception("No isotope standard found.")
             
-        b = a.split()
-        return float(b[3])
+        b = self._iso_index[isotope]
+        self._iso_stnd_cache[isotope] = float(b[3])
+        return self._iso_stnd_cache[isotope]
             
 class PhreeqcInputLog(object):
     """Logs IPhreeqc input to a text file.
@@ -274,6 +410,8 @@ class PhreeqcInputLog(object):
         
         Creates a .phr log file at the specified location. The first few lines
         are initialised with the date, time and full path to the database used.
+        The file is kept open until close() is called or the object is garbage
+        collected.
         
         Args:
             filename (str): Location to write the log file.
@@ -281,12 +419,12 @@ class PhreeqcInputLog(object):
         """
         
         self.filename = filename
-        self.pq_input = open(self.filename,'w')
-        self.pq_input.truncate()
+        self.pq_input = open(self.filename, 'w')
         self._preamble()
         
         self.pq_input.write("\nDATABASE %s" % dbpath)
-        self.pq_input.close()
+        self.pq_input.flush()
+        self._finalizer = weakref.finalize(self, self.pq_input.close)
         
     def _preamble(self):
         """Write log file preamble."""
@@ -313,10 +451,14 @@ class PhreeqcInputLog(object):
         Args:
             string (str): PHREEQC input text to be added to log file.
         """
-        self.pq_input = open(self.filename,'a')
         self._buffer()
         self.pq_input.write(string)
-        self.pq_input.close()
+        # flush so the log is complete if the next IPhreeqc call fails
+        self.pq_input.flush()
+        
+    def close(self):
+        """Close the log file."""
+        self._finalizer()
 
 class PostProcessor(object):
     """Performs offline calculations and formatting of model results.
@@ -349,9 +491,8 @@ class PostProcessor(object):
         self.tidy()
         self.calculate_radiocarbon()
         self.set_none()  
-        self.results_df = pd.DataFrame()
         self.CDA()     
-
+        
     
 
 
@@ -365,13 +506,12 @@ class PostProcessor(object):
         to the Simulator output dict.
         """
 
-        init = output_filter(self.s.output, 'step_desc', 'dissolve')
-        init_ca = init['Ca(mol/kgw)'][0]
-        init_c = init['C(mol/kgw)'][0]
-        ca = self.s.output['Ca(mol/kgw)']
-        c = self.s.output['C(mol/kgw)']
-        self.s.output['f_ca'] = [x / init_ca for x in ca]
-        self.s.output['f_c'] = [x / init_c for x in c]
+        o = self.s.output
+        i = next(i for i, d in enumerate(o['step_desc']) if 'dissolve' in d)
+        ca = np.asarray(o['Ca(mol/kgw)'], dtype=np.float64)
+        c = np.asarray(o['C(mol/kgw)'], dtype=np.float64)
+        o['f_ca'] = (ca / ca[i]).tolist()
+        o['f_c'] = (c / c[i]).tolist()
         
                 
 
@@ -389,38 +529,31 @@ class PostProcessor(object):
         
         trace_elements = ['Ba', 'Sr', 'Mg','U']
         output_names = ['Ba', 'Sr', 'Mg', 'U']
-        dissolved_ratios = {k : [] for k in trace_elements}
-        precipitate_ratios = {k : [] for k in trace_elements}
         
-        for i, desc in enumerate(a['step_desc']):
-            w = a['mass_H2O']
-            ca = a['Ca(mol/kgw)']
-            dissolved_ca = ca[i] * w[i]
-            
-            if 'CaCO3_precipitation' in desc:
-                solid_ca = dissolved_ca - ca[i-1] * w[i-1]
-                
-            for x in trace_elements:
-                x_dissolved = a[x+'(mol/kgw)'][i] * w[i]
-                try: 
-                    dissolved_ratios[x].append( x_dissolved / dissolved_ca )
-                except ZeroDivisionError:
-                    dissolved_ratios[x].append( 0 )
-                
-                # precipitated trace element = amount lost from solution
-                if 'CaCO3_precipitation' in desc:
-                    x_precip = x_dissolved - a[x+'(mol/kgw)'][i-1] * w[i-1]
-                    try: 
-                        precipitate_ratios[x].append( x_precip / solid_ca )
-                    except ZeroDivisionError:
-                        precipitate_ratios[x].append( 0 )
-                else:
-                        precipitate_ratios[x].append( 0 )
-         
-        for x_in, x_out in zip(trace_elements, output_names): 
-            self.s.output[x_out+'/Ca(mol/mol)'] = dissolved_ratios[x_in] 
-            precipitate_suffix = '_Calcite' if self.s.settings['precipitate_mineralogy'] == 'Calcite' else '_Aragonite' 
-            self.s.output[x_out+'/Ca(mol/mol)' + precipitate_suffix] = precipitate_ratios[x_in]
+        # moles in solution, one row per trace element
+        w = np.asarray(a['mass_H2O'], dtype=np.float64)
+        dissolved_ca = np.asarray(a['Ca(mol/kgw)'], dtype=np.float64) * w
+        x_dissolved = np.vstack([np.asarray(a[x+'(mol/kgw)'], 
+                                            dtype=np.float64) 
+                                 for x in trace_elements]) * w
+        dissolved_ratios = np.divide(x_dissolved, dissolved_ca, 
+                                     out=np.zeros_like(x_dissolved),
+                                     where=dissolved_ca != 0)
+        
+        # precipitated amount = amount lost from solution since the last step
+        # (step 0 compares with the final step, as list[i-1] did)
+        is_precip = np.array(['CaCO3_precipitation' in d 
+                              for d in a['step_desc']], dtype=bool)
+        solid_ca = dissolved_ca - np.roll(dissolved_ca, 1)
+        x_precip = x_dissolved - np.roll(x_dissolved, 1, axis=1)
+        precipitate_ratios = np.divide(x_precip, solid_ca, 
+                                       out=np.zeros_like(x_precip),
+                                       where=is_precip & (solid_ca != 0))
+        
+        precipitate_suffix = '_Calcite' if self.s.settings['precipitate_mineralogy'] == 'Calcite' else '_Aragonite' 
+        for j, x_out in enumerate(output_names): 
+            self.s.output[x_out+'/Ca(mol/mol)'] = dissolved_ratios[j].tolist()
+            self.s.output[x_out+'/Ca(mol/mol)' + precipitate_suffix] = precipitate_ratios[j].tolist()
             
     def UCa_mmol_to_mol(self):
         """UCa mmol/mol to mol/mol
@@ -432,20 +565,10 @@ class PostProcessor(object):
         Thus UCa is modelled as mmol/mol and other X/Ca as mol/mol
         This puts each X/Ca on the same scale"""
         
-        if self.s.settings['precipitate_mineralogy'] == 'Calcite':
-            UCa_Calcite = self.s.output.get('U/Ca(mol/mol)_Calcite')
-            UCa = self.s.output.get('U/Ca(mol/mol)')
-            UCa_Calcite = [value * 0.001 if value is not None else None for value in (UCa_Calcite or [])]
-            UCa = [value * 0.001 if value is not None else None for value in (UCa or [])]
-            self.s.output['U/Ca(mol/mol)_Calcite'] = UCa_Calcite
-            self.s.output['U/Ca(mol/mol)'] = UCa
-        elif self.s.settings['precipitate_mineralogy'] == 'Aragonite': 
-            UCa_Aragonite = self.s.output.get('U/Ca(mol/mol)_Aragonite')
-            UCa = self.s.output.get('U/Ca(mol/mol)')
-            UCa_Aragonite = [value * 0.001 if value is not None else None for value in (UCa_Aragonite or [])]
-            UCa = [value * 0.001 if value is not None else None for value in (UCa or [])]
-            self.s.output['U/Ca(mol/mol)_Aragonite'] = UCa_Aragonite
-            self.s.output['U/Ca(mol/mol)'] = UCa       
+        mineralogy = self.s.settings['precipitate_mineralogy']
+        if mineralogy in ('Calcite', 'Aragonite'):
+            for k in ('U/Ca(mol/mol)_' + mineralogy, 'U/Ca(mol/mol)'):
+                self.s.output[k] = _scale(self.s.output.get(k), 0.001)
            
         
     def CDA(self):
@@ -488,31 +611,11 @@ class PostProcessor(object):
             return
 
         try:
-            # Load the users time-series excel file
-            df = pd.read_csv(file_path)
-            # Strip whitespace from the headers and normalize column names by removing special characters
-            df.columns = df.columns.str.strip().str.lower().str.replace(r'[^a-z0-9]', '', regex=True)
-
-            age_column = [col for col in df.columns if 'age' in col.lower()]
-            d13C_columns = [col for col in df.columns if 'd13c' in col.lower()]
-            d18O_columns = [col for col in df.columns if 'd18o' in col.lower()]
-            mgca_column = [col for col in df.columns if 'mgca' in col.lower()]
-            dcp_column = [col for col in df.columns if 'dcp' in col.lower()]
-            d44Ca_column = [col for col in df.columns if 'd44ca' in col.lower()]
-            srca_column = [col for col in df.columns if 'srca' in col.lower()]
-            baca_column = [col for col in df.columns if 'baca' in col.lower()]
-            uca_column = [col for col in df.columns if 'uca' in col.lower()]
-
-            age_data = df[age_column[0]].tolist()
-            d13C_data = df[d13C_columns[0]].tolist() if d13C_columns else None
-            d18O_data = df[d18O_columns[0]].tolist() if d18O_columns else None
-            MgCa_data = df[mgca_column[0]].tolist() if mgca_column else None
-            dcp_data = df[dcp_column[0]].tolist() if dcp_column else None
-            d44Ca_data = df[d44Ca_column[0]].tolist() if d44Ca_column else None
-            SrCa_data = df[srca_column[0]].tolist() if srca_column else None
-            BaCa_data = df[baca_column[0]].tolist() if baca_column else None
-            UCa_data = df[uca_column[0]].tolist() if uca_column else None
-          
+            # Load the users time-series file (cached between models)
+            columns, arrays = _read_cda_data(file_path, 
+                                             os.path.getmtime(file_path))
+            (age_data, d13C_data, d18O_data, MgCa_data, dcp_data, d44Ca_data,
+             SrCa_data, BaCa_data, UCa_data) = columns
             
         except Exception as e:
             print(f"Error reading Excel file: {e}")
@@ -570,6 +673,35 @@ class PostProcessor(object):
         lengths = [len(self.s.output.get(keys[k], [])) for k in keys if keys[k] in self.s.output]
         num_data_points = min(lengths) if lengths else 0
         
+        # Observed data as float arrays for the tolerance checks below
+        d13C_arr = arrays[0]
+        proxies = list(zip(columns[2:], arrays[1:]))
+        (d18O_arr, MgCa_arr, dcp_arr, d44Ca_arr, SrCa_arr, BaCa_arr, 
+         UCa_arr) = arrays[1:]
+        proxy_tolerances = (d18O_tolerance, mg_tolerance, dcp_tolerance,
+                            d44Ca_tolerance, sr_tolerance, ba_tolerance, 
+                            u_tolerance)
+        
+        atm_d18O = self.s.settings['atm_d18O']
+        
+        # Define the keys to keep from self.s.settings **ADD atmo_exhange** 
+        desired_keys = [ 'temperature', 'kinetics_mode', 
+            'atm_O2', 'atm_d18O', 'atm_pCO2', 'atm_d13C', 'atm_R14C',
+            'soil_O2', 'soil_R14C', 'soil_d13C', 'soil_pCO2',  
+            'soil_Ba', 'soil_Ca', 'soil_Mg', 'soil_Sr', 'soil_U',  
+            'bedrock_BaCa', 'bedrock_MgCa', 'bedrock_SrCa',  
+            'bedrock_UCa', 'bedrock_d13C', 'bedrock_d44Ca',  
+            'bedrock_mineral', 'bedrock_pyrite',  
+            'gas_volume', 'reprecip', 'precipitate_mineralogy', 'cave_pCO2','cave_R14C','cave_d13C']
+        filtered_settings = {key: self.s.settings[key] for key in desired_keys if key in self.s.settings} 
+        
+        # Match records put the initial solution values after 'reprecip'
+        split = desired_keys.index('reprecip') + 1
+        settings_head = {k: v for k, v in filtered_settings.items() 
+                         if k in desired_keys[:split]}
+        settings_tail = {k: v for k, v in filtered_settings.items() 
+                         if k in desired_keys[split:]}
+        
         for i in range(num_data_points):
            d13C_spel = self.s.output.get(keys['d13C'], [None])[i]
            MgCa_spel =  self.s.output.get(keys['MgCa'], [None])[i]
@@ -599,18 +731,6 @@ class PostProcessor(object):
            BaCa_spel = np.nan if BaCa_spel is None else BaCa_spel
            UCa_spel = np.nan if UCa_spel is None else UCa_spel
         
-           Gkeys = [
-    'soil_pCO2', 'soil_d13C', 'cave_pCO2', 'gas_volume', 'temperature', 'atm_d18O', 
-    'bedrock_pyrite', 'soil_U', 'bedrock_UCa', 'soil_Mg', 'bedrock_MgCa', 'soil_Ba', 
-    'bedrock_BaCa', 'soil_Sr', 'bedrock_SrCa', 'soil_O2', 'soil_R14C', 'atm_pCO2', 'atm_d13C' 
-    ] 
-    
-           # Extract settings into a dictionary
-           settings = {key: self.s.settings[key] for key in Gkeys}
-
-           # Automatically create variables from dictionary keys
-           locals().update(settings)
-           
            f_ca = self.s.output.get('f_ca',[])
            f_ca = f_ca[i]
            ca = self.s.output.get('Ca(mol/kgw)',[])
@@ -618,23 +738,24 @@ class PostProcessor(object):
  
            d13C_DIC = self.s.output.get('d13C',[])
            d13C_DIC = d13C_DIC[1]
-           atm_d18O = self.s.settings['atm_d18O']
          
-        
-           # Define the keys to keep from self.s.settings **ADD atmo_exhange** 
-           desired_keys = [ 'temperature', 'kinetics_mode', 
-               'atm_O2', 'atm_d18O', 'atm_pCO2', 'atm_d13C', 'atm_R14C',
-               'soil_O2', 'soil_R14C', 'soil_d13C', 'soil_pCO2',  
-               'soil_Ba', 'soil_Ca', 'soil_Mg', 'soil_Sr', 'soil_U',  
-               'bedrock_BaCa', 'bedrock_MgCa', 'bedrock_SrCa',  
-               'bedrock_UCa', 'bedrock_d13C', 'bedrock_d44Ca',  
-               'bedrock_mineral', 'bedrock_pyrite',  
-               'gas_volume', 'reprecip', 'precipitate_mineralogy', 'cave_pCO2','cave_R14C','cave_d13C']
-           
 
-           # Iterate through the data points
-           for index in range(len(age_data)): 
-               # Handle d13C_value and calculate its residual
+           # Check which data points are within tolerance of this model 
+           # step. A missing d13C residual fails the check; missing or blank
+           # values for the other proxies are not checked.
+           d13C_res = d13C_spel - d13C_arr
+           match = np.ones(len(age_data), dtype=bool)
+           if d13C_data:
+               match &= np.abs(d13C_res) <= tolerance
+           spels = (d18O_spel, MgCa_spel, dcp_spel, d44Ca_spel, SrCa_spel, 
+                    BaCa_spel, UCa_spel)
+           for (data, arr), spel, tol in zip(proxies, spels, proxy_tolerances):
+               if data and spel:
+                   r = spel - arr
+                   match &= np.isnan(r) | (np.abs(r) <= tol)
+           
+           # Build records for the matching data points only
+           for index in np.flatnonzero(match).tolist(): 
                d13C_value = d13C_data[index] if d13C_data and index < len(d13C_data) else np.nan
                residual = d13C_spel - d13C_value if d13C_value is not np.nan else np.nan
      
@@ -642,16 +763,11 @@ class PostProcessor(object):
                # Base dictionary with common keys for CDA.xlsx  
                base_record = {  
                    'Age': age_data[index]} 
-               
-               for key in desired_keys: 
-                   if key in self.s.settings: 
-                       base_record[key] = self.s.settings[key] 
-                       
-                # After adding 'reprecip', insert your three keys before continuing 
-                   if key == 'reprecip': 
-                       base_record['d13C_init'] = d13C_DIC 
-                       base_record['Ca (mol/kgw)_init'] = ca 
-                       base_record['f_ca'] = f_ca
+               base_record.update(settings_head)
+               base_record['d13C_init'] = d13C_DIC 
+               base_record['Ca (mol/kgw)_init'] = ca 
+               base_record['f_ca'] = f_ca
+               base_record.update(settings_tail)
 
                
                # Add these columns at the end 
@@ -695,40 +811,33 @@ class PostProcessor(object):
                    if UCa_data and index < len(UCa_data) and UCa_spel and UCa_data[index] not in [None, '', float('nan')] 
                    else None)
 
-               # Check if residuals are within tolerance
-               residual_check = abs(residual) <= tolerance if d13C_data else True
-               d18O_check = abs(d18O_residual) <= d18O_tolerance if d18O_residual is not None and not math.isnan(d18O_residual) else True
-               MgCa_check = abs(MgCa_residual) <= mg_tolerance if MgCa_residual is not None and not math.isnan(MgCa_residual) else True
-               dcp_check = abs(dcp_residual) <= dcp_tolerance if dcp_residual is not None and not math.isnan(dcp_residual) else True
-               d44Ca_check = abs(d44Ca_residual) <= d44Ca_tolerance if d44Ca_residual is not None and not math.isnan(d44Ca_residual) else True
-               SrCa_check = abs(SrCa_residual) <= sr_tolerance if SrCa_residual is not None and not math.isnan(SrCa_residual) else True
-               BaCa_check = abs(BaCa_residual) <= ba_tolerance if BaCa_residual is not None and not math.isnan(BaCa_residual) else True
-               UCa_check = abs(UCa_residual) <= u_tolerance if UCa_residual is not None and not math.isnan(UCa_residual) else True
-            
-               if residual_check and MgCa_check and dcp_check and d44Ca_check and SrCa_check and BaCa_check and UCa_check and d18O_check: 
-                   extended_record = base_record.copy() 
-                   if d18O_data:  
-                       extended_record.update({
-                   'd18O': d18O_data[index],
-                   'CaveCalc d18O': d18O_spel,
-                   'd18O Residual': d18O_residual,
-                       })
-    
-                   if MgCa_data: 
-                       extended_record.update({'MgCa': MgCa_data[index], 'CaveCalc MgCa': MgCa_spel, 'MgCa Residual': MgCa_residual}) 
-                   if dcp_data: 
-                       extended_record.update({'DCP': dcp_data[index], 'CaveCalc DCP': dcp_spel, 'DCP residual': dcp_residual}) 
-                   if d44Ca_data:  
-                       extended_record.update({'d44Ca': d44Ca_data[index], 'CaveCalc d44Ca': d44Ca_spel, 'd44Ca residual': d44Ca_residual})
-                   if SrCa_data: 
-                       extended_record.update({'SrCa': SrCa_data[index], 'CaveCalc SrCa': SrCa_spel, 'SrCa residual': SrCa_residual})
-                   if BaCa_data: 
-                       extended_record.update({'BaCa': BaCa_data[index], 'CaveCalc BaCa': BaCa_spel, 'BaCa residual': BaCa_residual})
-                   if UCa_data: 
-                       extended_record.update({'UCa': UCa_data[index], 'CaveCalc UCa': UCa_spel, 'UCa residual': UCa_residual})    
+               extended_record = base_record.copy() 
+               if d18O_data:  
+                   extended_record.update({
+               'd18O': d18O_data[index],
+               'CaveCalc d18O': d18O_spel,
+               'd18O Residual': d18O_residual,
+                   })
 
-                   results.append(extended_record) 
-                   match_found = True 
+               if MgCa_data: 
+                   extended_record.update({'MgCa': MgCa_data[index], 'CaveCalc MgCa': MgCa_spel, 'MgCa Residual': MgCa_residual}) 
+               if dcp_data: 
+                   extended_record.update({'DCP': dcp_data[index], 'CaveCalc DCP': dcp_spel, 'DCP residual': dcp_residual}) 
+               if d44Ca_data:  
+                   extended_record.update({'d44Ca': d44Ca_data[index], 'CaveCalc d44Ca': d44Ca_spel, 'd44Ca residual': d44Ca_residual})
+               if SrCa_data: 
+                   extended_record.update({'SrCa': SrCa_data[index], 'CaveCalc SrCa': SrCa_spel, 'SrCa residual': SrCa_residual})
+               if BaCa_data: 
+                   extended_record.update({'BaCa': BaCa_data[index], 'CaveCalc BaCa': BaCa_spel, 'BaCa residual': BaCa_residual})
+               if UCa_data: 
+                   extended_record.update({'UCa': UCa_data[index], 'CaveCalc UCa': UCa_spel, 'UCa residual': UCa_residual})    
+
+               results.append(extended_record) 
+               match_found = True 
+           
+           # All_outputs below reports the d13C residual of the final data
+           # point for every row
+           residual = d13C_res[-1] if len(d13C_res) else np.nan
                    
                 
                 
@@ -754,82 +863,83 @@ class PostProcessor(object):
            input_ranges_df = pd.DataFrame(input_ranges_data)
         
            
-           # Iterate through the data points
-           for index in range(len(age_data)):  
-               # Handle d13C_value
-               d13C_value = d13C_data[index] if d13C_data and index < len(d13C_data) else np.nan
+           # Residuals (observed - modelled) for all data points at once
+           d18O_res = d18O_arr - d18O_spel
+           MgCa_res = MgCa_arr - MgCa_spel
+           dcp_res = dcp_arr - dcp_spel if dcp_spel is not None else None
+           d44Ca_res = d44Ca_arr - d44Ca_spel if d44Ca_spel is not None else None
+           SrCa_res = SrCa_arr - SrCa_spel
+           BaCa_res = BaCa_arr - BaCa_spel
+           UCa_res = UCa_arr - UCa_spel
+           
+           # Build this model step's rows a column at a time; single values
+           # are repeated for every data point
+           n = len(age_data)
+           all_columns = { 
+            'Age': age_data,  
+            'd13C': d13C_data if d13C_data else np.nan, 
+            'CaveCalc d13C': d13C_spel, 
+            'd13C residual': residual, 
+            'f_ca': f_ca, 
+            'd13C_init': d13C_DIC,
+            'Ca (mol/kgw)': ca,  
+            } 
+        
+           # Extend with all available data
+           if d18O_data:  
+               all_columns.update({
+                'd18O': d18O_data,
+                'CaveCalc d18O': d18O_spel,
+                'rainfall d18O': atm_d18O, 
+                'd18O residual': d18O_res, 
+            })
+        
+           if MgCa_data: 
+               all_columns.update({
+                'MgCa': MgCa_data, 
+                'CaveCalc MgCa': MgCa_spel,
+                'MgCa residual': MgCa_res,
+            })
+        
+           if dcp_data: 
+               all_columns.update({
+                'DCP': dcp_data, 
+                'CaveCalc DCP': dcp_spel,
+                'DCP residual': dcp_res, 
+            }) 
+        
+           if d44Ca_data: 
+               all_columns.update({ 
+                   'd44Ca': d44Ca_data, 
+                   'CaveCalc d44Ca': d44Ca_spel, 
+                   'd44Ca residual': d44Ca_res,
+           })
                
-               # Base dictionary with common keys for CDA.xlsx 
-               all_records = { 
-                'Age': age_data[index],  
-                'd13C': d13C_value, 
-                'CaveCalc d13C': d13C_spel, 
-                'd13C residual': residual, 
-                'f_ca': f_ca, 
-                'd13C_init': d13C_DIC,
-                'Ca (mol/kgw)': ca,  
-                } 
-            
-               # Extend the base record with all available data
-               all_all_records = all_records.copy() 
-               if d18O_data:  
-                   all_all_records.update({
-                    'd18O': d18O_data[index],
-                    'CaveCalc d18O': d18O_spel,
-                    'rainfall d18O': atm_d18O, 
-                    'd18O residual': d18O_data[index] -  d18O_spel, 
-                })
-            
-               if MgCa_data: 
-                   all_all_records.update({
-                    'MgCa': MgCa_data[index], 
-                    'CaveCalc MgCa': MgCa_spel,
-                    'MgCa residual': MgCa_data[index] -  MgCa_spel,
-                })
-            
-               if dcp_data: 
-                   dcp_val = dcp_data[index]
-                   all_all_records.update({
-                    'DCP': dcp_val, 
-                    'CaveCalc DCP': dcp_spel,
-                    'DCP residual': dcp_data[index] -  dcp_spel if dcp_spel is not None and dcp_val is not None else None, 
-                }) 
-            
-               if d44Ca_data: 
-                   d44Ca_val = d44Ca_data[index] 
-                   all_all_records.update({ 
-                       'd44Ca': d44Ca_val, 
-                       'CaveCalc d44Ca': d44Ca_spel, 
-                       'd44Ca residual': d44Ca_val - d44Ca_spel if d44Ca_spel is not None and d44Ca_val is not None else None,
-               })
-
-                   
-               if SrCa_data: 
-                   all_all_records.update({
-                    'SrCa': SrCa_data[index], 
-                    'CaveCalc SrCa': SrCa_spel,
-                    'SrCa residual': SrCa_data[index] -  SrCa_spel,
-                })
-            
-               if BaCa_data: 
-                   all_all_records.update({
-                    'BaCa': BaCa_data[index], 
-                    'CaveCalc BaCa': BaCa_spel,
-                    'BaCa residual': BaCa_data[index] -  BaCa_spel, 
-                })
-            
-               if UCa_data: 
-                   all_all_records.update({
-                    'UCa': UCa_data[index], 
-                    'CaveCalc UCa': UCa_spel,
-                    'UCa residual': UCa_data[index] -  UCa_spel,
-                })
-                   
-               filtered_settings = {key: self.s.settings[key] for key in desired_keys if key in self.s.settings} 
-               all_all_records.update(filtered_settings)
+           if SrCa_data: 
+               all_columns.update({
+                'SrCa': SrCa_data, 
+                'CaveCalc SrCa': SrCa_spel,
+                'SrCa residual': SrCa_res,
+            })
+        
+           if BaCa_data: 
+               all_columns.update({
+                'BaCa': BaCa_data, 
+                'CaveCalc BaCa': BaCa_spel,
+                'BaCa residual': BaCa_res, 
+            })
+        
+           if UCa_data: 
+               all_columns.update({
+                'UCa': UCa_data, 
+                'CaveCalc UCa': UCa_spel,
+                'UCa residual': UCa_res,
+            })
+               
+           all_columns.update(filtered_settings)
 
-               # Append the extended record to results
-               all_record.append(all_all_records) 
+           # Append this step's rows to results
+           all_record.append(pd.DataFrame(all_columns, index=pd.RangeIndex(n)))
 
                  
          
@@ -837,16 +947,10 @@ class PostProcessor(object):
 
         
 
-        # Convert results to a DataFrame
-        all_record_df = pd.DataFrame(all_record)
-        
-        # Handle 'All outputs' CSV 
-        if not os.path.exists(all_outputs_csv):  
-            all_record_df.to_csv(all_outputs_csv, index=False) 
-            print(f"CDA was initialised for the first time in the output directory. Created new {all_outputs_csv}")
-        else: 
-            # Append new data to 'All outputs' CSV 
-            all_record_df.to_csv(all_outputs_csv, mode='a', header=False, index=False) 
+        # Add new data to the 'All outputs' CSV 
+        if all_record:
+            _cda_append(all_outputs_csv, 
+                        pd.concat(all_record, ignore_index=True))
        
          
         # Handle 'Tolerances' CSV (Check if the file exists or create a new one) 
@@ -898,27 +1002,9 @@ class PostProcessor(object):
         # Proceed with results processing only if a match was found
         if match_found: 
             
-            # Process results and calculate mean
-            if results: 
-                new_results_df = pd.DataFrame(results)
-            
-            # Combine new results with existing results
-            if not self.results_df.empty:  
-                combined_df = pd.concat([self.results_df, new_results_df], ignore_index=True)
-            else:
-                combined_df = new_results_df
-            
-            
-            # Update self.results_df to be the aggregated DataFrame
-            self.results_df = combined_df
-
-            # Save results to Matches CSV 
-            if not os.path.exists(matches_csv): 
-                self.results_df.to_csv(matches_csv, index=False) 
-                print(f"Match! Created new file '{matches_csv}' and saved results.") 
-            else: 
-                self.results_df.to_csv(matches_csv, mode='a', header=False, index=False) 
-                print(f"Match! Appended to '{matches_csv}' and saved results.")
+            # Queue results for the Matches CSV 
+            _cda_append(matches_csv, results)
+            print(f"Match! Results added to '{matches_csv}'.")
                        
         
             
@@ -1091,6 +1177,50 @@ def output_filter(src, key, value):
         o[k] = [a for i,a in enumerate(v) if i in inds]
     return o
     
+def _scale(values, factor):
+    """Multiply a list of numbers by factor, returning a list. None -> nan."""
+    
+    a = np.array(values or [], dtype=np.float64)
+    return (a * factor).tolist()
+    
+@lru_cache(maxsize=8)
+def _read_cda_data(file_path, stamp):
+    """Read a CDA time-series csv file (memoised on path and mtime).
+    
+    Column names are stripped, lower-cased and reduced to alphanumeric 
+    characters, then matched by substring.
+    
+    Args:
+        file_path: Path to the csv file.
+        stamp: Modification time of file_path, so edits are re-read.
+    Returns:
+        A tuple (columns, arrays). columns holds the age, d13C, d18O, MgCa,
+        DCP, d44Ca, SrCa, BaCa and UCa data as lists (None where the file has
+        no such column). arrays holds the same data, excluding age, as float 
+        arrays with missing or blank values (and absent columns) as nan.
+    """
+    
+    df = pd.read_csv(file_path)
+    # Strip whitespace from the headers and normalize column names by removing special characters
+    df.columns = df.columns.str.strip().str.lower().str.replace(r'[^a-z0-9]', '', regex=True)
+    
+    columns = []
+    for name in ('age', 'd13c', 'd18o', 'mgca', 'dcp', 'd44ca', 'srca', 
+                 'baca', 'uca'):
+        match = [col for col in df.columns if name in col]
+        columns.append(df[match[0]].tolist() if match else None)
+    if columns[0] is None:
+        raise KeyError("No age column found")
+        
+    arrays = []
+    for data in columns[1:]:
+        if data:
+            a = pd.to_numeric(pd.Series(data), errors='coerce')
+            arrays.append(a.to_numpy(dtype=np.float64))
+        else:
+            arrays.append(np.full(len(columns[0]), np.nan))
+    return tuple(columns), tuple(arrays)
+    
 def matlab_header_parse(dictionary):
     """Remove illegal characters from dictionary keys.
     
@@ -1104,17 +1234,18 @@ def matlab_header_parse(dictionary):
         A dict with modified key names
     """
     
-    b = {}
-    for k in dictionary:
-        new_k = k.replace(')', '') # because matlab is fussy
-        new_k = new_k.replace('(','_') # about variable names
-        new_k = new_k.replace('-','') # and does not allow these
-        new_k = new_k.replace('/','') # characters
-        new_k = new_k.replace('[','')
-        new_k = new_k.replace(']','')    
-        
-        b[new_k] = dictionary[k]
-    return b
+    return {matlab_name(k) : v for k, v in dictionary.items()}
+
+# because matlab is fussy about variable names and does not allow these
+# characters
+MATLAB_TABLE = str.maketrans({')' : None, '(' : '_', '-' : None, '/' : None,
+                              '[' : None, ']' : None})
+
+@lru_cache(maxsize=None)
+def matlab_name(key):
+    """Return key with matlab-illegal characters removed (memoised)."""
+    
+    return key.translate(MATLAB_TABLE)
     
 def numpify(dictionary):
     """Prepare a dict of lists for writing to a .mat file.
@@ -1203,3 +1334,63 @@ def save_csv(dictionary, filename):
 
     
 
+
+# Open CDA results files, keyed on file path: (file, csv.DictWriter). 
+# PostProcessor.CDA runs once per model; each file is opened once per run and 
+# rows are streamed through a large write buffer.
+_CDA_WRITERS = {}
+
+def _cda_append(filename, records):
+    """Append rows to a CDA .csv file.
+    
+    The file is opened on first use and kept open until flush_cda() is 
+    called. Rows are flushed to the file before returning, so each model's
+    results are on disk once it finishes. A new file gets a header from the first rows written; an
+    existing file keeps its header and rows are matched to it by column 
+    name. nan values are written as empty fields.
+    
+    Args:
+        filename: Path to the .csv file.
+        records: A DataFrame, or a list of dicts (one per row).
+    """
+    
+    frame = isinstance(records, pd.DataFrame)
+    if len(records) == 0:
+        return
+    if filename not in _CDA_WRITERS:
+        header = None
+        if os.path.exists(filename) and os.path.getsize(filename) > 0:
+            with open(filename, newline='') as f:
+                header = next(csv.reader(f), None)
+        f = open(filename, 'a', newline='', buffering=1 << 20)
+        new = header is None
+        if new:
+            if frame:
+                header = list(records.columns)
+            else:
+                header = list(dict.fromkeys(k for r in records for k in r))
+        # match the line endings pandas writes
+        w = csv.DictWriter(f, fieldnames=header, extrasaction='ignore',
+                           lineterminator=os.linesep)
+        if new:
+            w.writeheader()
+            print(f"Created new {filename}")
+        _CDA_WRITERS[filename] = (f, w)
+        
+    f, w = _CDA_WRITERS[filename]
+    if frame:
+        records.reindex(columns=w.fieldnames).to_csv(f, header=False, 
+                                                     index=False)
+    else:
+        w.writerows({k: '' if isinstance(v, float) and v != v else v 
+                     for k, v in r.items()} for r in records)
+    f.flush()
+        
+def flush_cda():
+    """Close all open CDA .csv files."""
+    
+    while _CDA_WRITERS:
+        f, _ = _CDA_WRITERS.popitem()[1]
+        f.close()
+
+atexit.register(flush_cda)
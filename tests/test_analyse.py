@@ -0,0 +1,24 @@
+"""Tests for cavecalc.analyse.Evaluate."""
+
+import unittest
+
+from cavecalc.analyse import Evaluate
+from cavecalc.setter import SettingsObject
+
+class TestGetSettingValues(unittest.TestCase):
+    
+    def setUp(self):
+        self.e = Evaluate()
+        self.e._settings = [SettingsObject(id=0, gas_volume=10),
+                            SettingsObject(id=1, gas_volume=20)]
+        
+    def test_values(self):
+        v = self.e.get_setting_values('gas_volume')
+        self.assertEqual(v, [10, 20])
+        
+    def test_unknown_setting(self):
+        with self.assertRaises(KeyError):
+            self.e.get_setting_values('not_a_setting')
+
+if __name__ == '__main__':
+    unittest.main()
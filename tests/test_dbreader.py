@@ -0,0 +1,52 @@
+"""Regression tests for cavecalc.util.DBReader."""
+
+import os
+import tempfile
+import unittest
+
+from cavecalc.util import DBReader
+
+# X depends on A and B, and A also depends on B (a shared dependency).
+DIAMOND_DB = """NAMED_EXPRESSIONS
+Log_alpha_13C_X
+    -add_logk       Log_alpha_13C_B    1
+    -add_logk       Log_alpha_13C_A    1
+
+Log_alpha_13C_A
+    -add_logk       Log_alpha_13C_B    1
+    -ln_alpha1000   2.0
+
+Log_alpha_13C_B
+    -ln_alpha1000   4.0
+
+Log_alpha_13C_C
+    -add_logk       Log_alpha_13C_D    1
+
+Log_alpha_13C_D
+    -add_logk       Log_alpha_13C_C    1
+
+"""
+
+class TestGet1000lnalpha(unittest.TestCase):
+    
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.dat')
+        with os.fdopen(fd, 'w') as f:
+            f.write(DIAMOND_DB)
+        # an absolute path overrides the cavecalc.data directory
+        self.reader = DBReader(self.path)
+        
+    def tearDown(self):
+        os.remove(self.path)
+        
+    def test_shared_dependency(self):
+        # X = A + B = (B + 2) + B = 10
+        v = self.reader.get_1000lnalpha('13C', 'X', 298.15)
+        self.assertAlmostEqual(v, 10.0)
+        
+    def test_circular_dependency(self):
+        with self.assertRaisesRegex(Exception, 'Circular'):
+            self.reader.get_1000lnalpha('13C', 'C', 298.15)
+
+if __name__ == '__main__':
+    unittest.main()